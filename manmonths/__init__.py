@@ -0,0 +1,37 @@
+from .engine import (
+    DEFAULT_ORDER,
+    MAX_YEARLY_CAPACITY,
+    ORDERS,
+    SOLVERS,
+    allocate,
+    allocate_greedy,
+    allocation_order,
+    unallocated_report,
+)
+from .flow import allocate_optimal
+
+
+def __getattr__(name):
+    # The workbook pipeline pulls in openpyxl; load it only when it is used
+    if name == "process_excel_data":
+        from .pipeline import process_excel_data
+        return process_excel_data
+    if name == "allocate_data":
+        from .export import allocate_data
+        return allocate_data
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = [
+    "DEFAULT_ORDER",
+    "MAX_YEARLY_CAPACITY",
+    "ORDERS",
+    "SOLVERS",
+    "allocate",
+    "allocate_data",
+    "allocate_greedy",
+    "allocate_optimal",
+    "allocation_order",
+    "process_excel_data",
+    "unallocated_report",
+]
@@ -0,0 +1,218 @@
+# ------------------------------------------------
+# Benchmark: συνθετικά INPUT και χρόνοι ανά φάση
+# ------------------------------------------------
+# python -m manmonths.bench [--scenario medium] [--repeat 5] [--json out.json]
+#                           [--compare baseline.json]
+#
+# Δημιουργεί συνθετικά INPUT (πλήθος γραμμών, διάρκεια περιόδων, εύρος ετών,
+# ποσοστό κίτρινων γραμμών, πυκνότητα μορφοποίησης), τρέχει το
+# process_excel_data και κρατά τους χρόνους ανά φάση από την αναφορά εκτέλεσης
+# (result["report"], βλ. progress.PHASES). Η μέγιστη μνήμη μετριέται σε
+# ξεχωριστή εκτέλεση με tracemalloc, ώστε να μην επηρεάζει τους χρόνους. Τα
+# αποτελέσματα γράφονται σε JSON και μπορούν να συγκριθούν με προηγούμενη
+# εκτέλεση (--compare).
+
+import argparse
+import io
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+import openpyxl
+from openpyxl.styles import Border, Font, PatternFill, Side
+
+from .engine import SOLVERS
+from .pipeline import process_excel_data
+from .progress import PHASES
+from .reader import AM_HEADER, PERIOD_HEADER
+from .template import TEMPLATE_FILE_NAME
+
+# rows, (min, max) period length in months, (first, last) year, yellow ratio,
+# share of CV cells with their own formatting
+SCENARIOS = {
+    "small": {"rows": 30, "span": (1, 36), "years": (2010, 2024), "yellow_ratio": 0.25, "format_density": 0.2},
+    "medium": {"rows": 300, "span": (1, 48), "years": (1995, 2024), "yellow_ratio": 0.25, "format_density": 0.5},
+    "large": {"rows": 2000, "span": (1, 60), "years": (1985, 2024), "yellow_ratio": 0.25, "format_density": 0.8},
+}
+
+EXTRA_CV_COLUMNS = ("ΕΡΓΟ", "ΦΟΡΕΑΣ", "ΘΕΣΗ", "ΠΕΡΙΓΡΑΦΗ")
+
+# ARGB as Excel writes it, so reader.is_yellow_cell recognises the rows
+_yellow = PatternFill(start_color="FFFFFF00", end_color="FFFFFF00", fill_type="solid")
+_cv_fills = [PatternFill(start_color=c, end_color=c, fill_type="solid") for c in ("DDEBF7", "E2EFDA", "FCE4D6")]
+_cv_fonts = [Font(bold=True), Font(italic=True), Font(color="1F4E78")]
+_cv_border = Border(bottom=Side(style="thin"))
+
+
+def generate_input(rows=300, span=(1, 48), years=(1995, 2024), yellow_ratio=0.25, format_density=0.5, seed=0):
+    """Build a synthetic INPUT workbook and return it as xlsx bytes."""
+    rnd = random.Random(seed)
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.append([*EXTRA_CV_COLUMNS[:1], PERIOD_HEADER, AM_HEADER, *EXTRA_CV_COLUMNS[1:]])
+
+    for r in range(2, rows + 2):
+        start = rnd.randint(years[0] * 12, years[1] * 12 + 11)
+        end = min(start + rnd.randint(*span) - 1, years[1] * 12 + 11)
+        (start_y, start_m), (end_y, end_m) = divmod(start, 12), divmod(end, 12)
+        if start == end:
+            period = f"{start_m + 1:02d}/{start_y}"
+        else:
+            period = f"{start_m + 1:02d}/{start_y} - {end_m + 1:02d}/{end_y}"
+        am = rnd.randint(1, end - start + 1)
+        ws.append([f"Έργο {r - 1}", period, am, f"Φορέας {rnd.randint(1, 40)}", "Μέλος ομάδας", "Περιγραφή " * 5])
+
+        if rnd.random() < yellow_ratio:
+            ws.cell(r, 2).fill = _yellow
+        for c in range(1, ws.max_column + 1):
+            if rnd.random() < format_density:
+                cell = ws.cell(r, c)
+                cell.font = rnd.choice(_cv_fonts)
+                cell.border = _cv_border
+                if c != 2:
+                    cell.fill = rnd.choice(_cv_fills)
+
+    for letter, width in zip("ABCDEF", (30, 22, 14, 24, 18, 50)):
+        ws.column_dimensions[letter].width = width
+
+    buffer = io.BytesIO()
+    wb.save(buffer)
+    return buffer.getvalue()
+
+
+def close_output(result):
+    """Release the spooled output of a run (its bytes are not needed here)."""
+    if result["output"] is not None:
+        result["output"].close()
+
+
+def time_phases(template_path, input_bytes, **options):
+    """Run the pipeline once; return its run report."""
+    result = process_excel_data(template_path, io.BytesIO(input_bytes), **options)
+    close_output(result)
+    return result["report"]
+
+
+def peak_memory(template_path, input_bytes, **options):
+    """Peak Python heap (bytes) of one pipeline run, measured with tracemalloc."""
+    tracemalloc.start()
+    try:
+        close_output(process_excel_data(template_path, io.BytesIO(input_bytes), **options))
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run_scenario(name, params, template_path=TEMPLATE_FILE_NAME, repeat=5, seed=0, **options):
+    input_bytes = generate_input(seed=seed, **params)
+
+    # The first run also prepares the template skeleton (cached per process)
+    cold = time_phases(template_path, input_bytes, **options)
+    runs = [time_phases(template_path, input_bytes, **options) for _ in range(repeat)]
+
+    phases = {}
+    for phase in PHASES:
+        samples = [run["phases"][phase] for run in runs if phase in run["phases"]]
+        if samples:
+            phases[phase] = {"median": statistics.median(samples), "min": min(samples)}
+    totals = [run["total_seconds"] for run in runs]
+
+    return {
+        "scenario": name,
+        "params": {**params, "seed": seed, **options},
+        "input_bytes": len(input_bytes),
+        "repeat": repeat,
+        "cold": {"total": cold["total_seconds"], "phases": cold["phases"]},
+        "counters": cold["counters"],
+        "total": {"median": statistics.median(totals), "min": min(totals)},
+        "phases": phases,
+        "peak_memory_bytes": peak_memory(template_path, input_bytes, **options),
+    }
+
+
+def environment():
+    return {
+        "python": platform.python_version(),
+        "openpyxl": openpyxl.__version__,
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def compare(current, baseline):
+    """Print the median time and peak memory of each scenario against a baseline."""
+    previous = {s["scenario"]: s for s in baseline["scenarios"]}
+    for scenario in current["scenarios"]:
+        before = previous.get(scenario["scenario"])
+        if before is None:
+            continue
+        print(f"{scenario['scenario']}:")
+        rows = [("total", before["total"]["median"], scenario["total"]["median"])]
+        rows += [
+            (phase, before["phases"][phase]["median"], stats["median"])
+            for phase, stats in scenario["phases"].items() if phase in before["phases"]
+        ]
+        for label, old, new in rows:
+            print(f"  {label:<10} {old * 1000:9.1f} ms -> {new * 1000:9.1f} ms  ({new / old if old else float('nan'):.2f}x)")
+        old_mem, new_mem = before["peak_memory_bytes"], scenario["peak_memory_bytes"]
+        print(f"  {'memory':<10} {old_mem / 2**20:9.1f} MB -> {new_mem / 2**20:9.1f} MB  ({new_mem / old_mem if old_mem else float('nan'):.2f}x)")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m manmonths.bench", description="Benchmark του process_excel_data.")
+    parser.add_argument("--scenario", action="append", choices=list(SCENARIOS),
+                        help="Σενάριο (επαναλαμβανόμενο, default: όλα)")
+    parser.add_argument("--rows", type=int, help="Πλήθος γραμμών (αντικαθιστά το σενάριο)")
+    parser.add_argument("--span", type=int, nargs=2, metavar=("MIN", "MAX"),
+                        help="Ελάχιστη και μέγιστη διάρκεια περιόδου σε μήνες")
+    parser.add_argument("--years", type=int, nargs=2, metavar=("FIRST", "LAST"), help="Πρώτο και τελευταίο έτος")
+    parser.add_argument("--yellow-ratio", type=float, help="Ποσοστό κίτρινων γραμμών")
+    parser.add_argument("--format-density", type=float, help="Ποσοστό μορφοποιημένων κελιών CV")
+    parser.add_argument("--repeat", type=int, default=5, help="Επαναλήψεις ανά σενάριο (default: 5)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--template", default=TEMPLATE_FILE_NAME)
+    parser.add_argument("--solver", choices=list(SOLVERS), default="greedy")
+    parser.add_argument("--cv-values-only", action="store_true")
+    parser.add_argument("--json", help="Αρχείο JSON για τα αποτελέσματα")
+    parser.add_argument("--compare", help="JSON προηγούμενης εκτέλεσης για σύγκριση")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    overrides = {
+        key: value for key, value in (
+            ("rows", args.rows), ("span", args.span and tuple(args.span)), ("years", args.years and tuple(args.years)),
+            ("yellow_ratio", args.yellow_ratio), ("format_density", args.format_density),
+        ) if value is not None
+    }
+
+    results = {"environment": environment(), "scenarios": []}
+    for name in args.scenario or list(SCENARIOS):
+        scenario = run_scenario(
+            name, {**SCENARIOS[name], **overrides}, template_path=args.template, repeat=args.repeat,
+            seed=args.seed, solver=args.solver, cv_values_only=args.cv_values_only,
+        )
+        results["scenarios"].append(scenario)
+        phases = ", ".join(f"{p} {s['median'] * 1000:.1f}" for p, s in scenario["phases"].items())
+        print(
+            f"{name}: {scenario['total']['median'] * 1000:.1f} ms ({phases}), "
+            f"peak {scenario['peak_memory_bytes'] / 2**20:.1f} MB",
+            file=sys.stderr,
+        )
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(results, json.load(f))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,230 @@
+# ------------------------------------------------
+# Batch CLI: πολλά INPUT σε παράλληλα processes
+# ------------------------------------------------
+# python -m manmonths <φάκελος ή glob> [...] --output-dir out --workers 8
+#
+# Κάθε INPUT επεξεργάζεται σε ξεχωριστό process (το openpyxl είναι CPU-bound
+# και μονονηματικό). Γράφεται το "<όνομα>_ΚΑΤΑΝΟΜΗ ΑΜ.xlsx" κάθε αρχείου, δίπλα
+# του η αναφορά εκτέλεσης "<όνομα>_ΚΑΤΑΝΟΜΗ ΑΜ.report.json" (χρόνοι ανά φάση,
+# μετρητές, διαγνωστικά) και ένα summary JSON με τα σύνολα και τα έργα με μη
+# κατανεμημένους ΑΜ. Με --format json/csv γράφονται μόνο τα δεδομένα της
+# κατανομής (βλ. export), χωρίς template και xlsx. Με --state-dir η κατάσταση
+# της κατανομής κάθε INPUT αποθηκεύεται ("<όνομα>.state.json") και η επόμενη
+# εκτέλεση υπολογίζει ξανά μόνο ό,τι άλλαξε (βλ. incremental).
+
+import argparse
+import glob
+import json
+import os
+import shutil
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from .engine import SOLVERS
+from .template import ROW_INDEX_FORMULA, ROW_INDEX_MODES, TEMPLATE_FILE_NAME
+
+OUTPUT_SUFFIX = "_ΚΑΤΑΝΟΜΗ ΑΜ.xlsx"
+REPORT_SUFFIX = "_ΚΑΤΑΝΟΜΗ ΑΜ.report.json"
+STATE_SUFFIX = ".state.json"
+DATA_SUFFIX = "_ΚΑΤΑΝΟΜΗ ΑΜ"
+# Data-only formats of export (kept here so the CLI does not import it up front)
+DATA_FORMATS = ("json", "csv")
+OUTPUT_FORMATS = ("xlsx", *DATA_FORMATS)
+
+
+def output_file_name(input_path, suffix=OUTPUT_SUFFIX):
+    return f"{os.path.splitext(os.path.basename(input_path))[0]}{suffix}"
+
+
+def write_report(input_path, output_dir, run):
+    report_path = os.path.join(output_dir, output_file_name(input_path, REPORT_SUFFIX))
+    with open(report_path, "w", encoding="utf-8") as f:
+        json.dump({"input": input_path, **run["report"], "diagnostics": run["diagnostics"]},
+                  f, ensure_ascii=False, indent=2, default=str)
+    return report_path
+
+
+def collect_inputs(patterns):
+    """Expand directories and glob patterns into a sorted list of .xlsx inputs."""
+    paths = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            candidates = glob.glob(os.path.join(pattern, "*.xlsx"))
+        else:
+            candidates = glob.glob(pattern, recursive=True)
+        for path in candidates:
+            name = os.path.basename(path)
+            # Skip Excel lock files and our own outputs
+            if name.startswith("~$") or name.endswith(OUTPUT_SUFFIX):
+                continue
+            if os.path.isfile(path):
+                paths.add(os.path.abspath(path))
+    return sorted(paths)
+
+
+def write_output(input_path, output_dir, run, output_format):
+    """Write the run's output file(s); returns the path, or the list of CSV paths."""
+    if output_format == "xlsx":
+        output_path = os.path.join(output_dir, output_file_name(input_path))
+        with run["output"] as output, open(output_path, "wb") as f:
+            shutil.copyfileobj(output, f)
+        return output_path
+
+    from .export import csv_tables, to_csv, to_json
+
+    if output_format == "json":
+        output_path = os.path.join(output_dir, output_file_name(input_path, f"{DATA_SUFFIX}.json"))
+        with open(output_path, "w", encoding="utf-8") as f:
+            f.write(to_json(run["output"]))
+        return output_path
+
+    output_paths = []
+    for name, (header, rows) in csv_tables(run["output"]).items():
+        output_path = os.path.join(output_dir, output_file_name(input_path, f"{DATA_SUFFIX}.{name}.csv"))
+        with open(output_path, "w", encoding="utf-8", newline="") as f:
+            f.write(to_csv(header, rows))
+        output_paths.append(output_path)
+    return output_paths
+
+
+def load_state(state_path):
+    if state_path is None or not os.path.exists(state_path):
+        return None if state_path is None else {}
+    with open(state_path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def process_file(input_path, output_dir, template_path=TEMPLATE_FILE_NAME, solver="greedy", cv_values_only=False,
+                 output_format="xlsx", state_dir=None, row_index=ROW_INDEX_FORMULA):
+    """Worker entry point: process one INPUT and write its output file(s)."""
+    result = {"input": input_path, "output": None, "report": None, "diagnostics": []}
+    state_path = os.path.join(state_dir, output_file_name(input_path, STATE_SUFFIX)) if state_dir else None
+    try:
+        state = load_state(state_path)
+        with open(input_path, "rb") as f:
+            if output_format == "xlsx":
+                from .pipeline import process_excel_data
+
+                run = process_excel_data(template_path, f, solver=solver, cv_values_only=cv_values_only, state=state,
+                                         row_index=row_index)
+            else:
+                from .export import allocate_data
+
+                run = allocate_data(f, solver=solver, state=state)
+    except Exception as e: # one bad CV must not stop the batch
+        result.update(status="error", error=f"{type(e).__name__}: {e}")
+        return result
+
+    result["diagnostics"] = run["diagnostics"]
+    result["report"] = write_report(input_path, output_dir, run)
+    if run["output"] is None:
+        result.update(status="error", error="; ".join(d["message"] for d in run["diagnostics"]))
+        return result
+
+    if state_path is not None:
+        with open(state_path, "w", encoding="utf-8") as f:
+            json.dump(run["state"], f)
+
+    result.update(
+        status="ok",
+        output=write_output(input_path, output_dir, run, output_format),
+        allocated_am=sum(run["yearly_am_totals"].values()),
+        unallocated_am=sum(p["unallocated_am"] for p in run["unallocated_projects"]),
+        yearly_am_totals={str(y): total for y, total in sorted(run["yearly_am_totals"].items())},
+        yearly_overages={str(y): over for y, over in sorted(run["yearly_overages"].items())},
+        max_yearly_capacity=run["max_yearly_capacity"],
+        unallocated_projects=run["unallocated_projects"],
+    )
+    return result
+
+
+def run_batch(input_paths, output_dir, workers=None, template_path=TEMPLATE_FILE_NAME, solver="greedy",
+              cv_values_only=False, output_format="xlsx", state_dir=None, progress=None, row_index=ROW_INDEX_FORMULA):
+    """Process ``input_paths`` across a process pool and return the summary dict."""
+    os.makedirs(output_dir, exist_ok=True)
+    if state_dir is not None:
+        os.makedirs(state_dir, exist_ok=True)
+    template_path = os.path.abspath(template_path)
+    results = []
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(process_file, path, output_dir, template_path, solver, cv_values_only, output_format,
+                        state_dir, row_index)
+            for path in input_paths
+        ]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            if progress:
+                progress(result, len(results), len(futures))
+
+    results.sort(key=lambda r: r["input"])
+    ok = [r for r in results if r["status"] == "ok"]
+    return {
+        "totals": {
+            "files": len(results),
+            "succeeded": len(ok),
+            "failed": len(results) - len(ok),
+            "allocated_am": sum(r["allocated_am"] for r in ok),
+            "unallocated_am": sum(r["unallocated_am"] for r in ok),
+            "files_with_unallocated": sum(1 for r in ok if r["unallocated_projects"]),
+        },
+        "files": results,
+    }
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m manmonths",
+        description="Κατανομή ανθρωπομηνών για πολλά INPUT excel (batch).",
+    )
+    parser.add_argument("inputs", nargs="+", help="Φάκελοι ή glob patterns με INPUT .xlsx")
+    parser.add_argument("-o", "--output-dir", default="output", help="Φάκελος εξόδου (default: output)")
+    parser.add_argument("-w", "--workers", type=int, default=None,
+                        help="Πλήθος processes (default: όλοι οι πυρήνες)")
+    parser.add_argument("--template", default=TEMPLATE_FILE_NAME, help=f"Template (default: '{TEMPLATE_FILE_NAME}')")
+    parser.add_argument("--solver", choices=list(SOLVERS), default="greedy", help="Αλγόριθμος κατανομής")
+    parser.add_argument("--cv-values-only", action="store_true", help="Φύλλο CV μόνο με τιμές (ταχύτερο)")
+    parser.add_argument("--row-index", choices=ROW_INDEX_MODES, default=ROW_INDEX_FORMULA,
+                        help="Στήλη Α/Α της ΑΝΑΛΥΣΗ: τύποι MATCH (default) ή σταθερές τιμές (χωρίς επανυπολογισμό)")
+    parser.add_argument("--format", choices=OUTPUT_FORMATS, default="xlsx",
+                        help="Μορφή εξόδου: xlsx (default) ή μόνο δεδομένα κατανομής σε json/csv")
+    parser.add_argument("--state-dir", default=None,
+                        help="Φάκελος με την κατάσταση κάθε INPUT για επαναληπτική κατανομή")
+    parser.add_argument("--summary", default=None,
+                        help="Αρχείο summary JSON (default: <output-dir>/summary.json)")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    if args.format == "xlsx" and not os.path.exists(args.template):
+        print(f"Το αρχείο template '{args.template}' δεν βρέθηκε.", file=sys.stderr)
+        return 2
+
+    input_paths = collect_inputs(args.inputs)
+    if not input_paths:
+        print("Δεν βρέθηκαν αρχεία INPUT.", file=sys.stderr)
+        return 2
+
+    def progress(result, done, total):
+        status = "OK " if result["status"] == "ok" else "ERR"
+        print(f"[{done}/{total}] {status} {os.path.basename(result['input'])}", file=sys.stderr)
+
+    summary = run_batch(input_paths, args.output_dir, workers=args.workers, template_path=args.template,
+                        solver=args.solver, cv_values_only=args.cv_values_only, output_format=args.format,
+                        state_dir=args.state_dir, progress=progress, row_index=args.row_index)
+
+    summary_path = args.summary or os.path.join(args.output_dir, "summary.json")
+    with open(summary_path, "w", encoding="utf-8") as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2, default=str)
+
+    totals = summary["totals"]
+    print(
+        f"{totals['succeeded']}/{totals['files']} αρχεία, κατανεμημένοι ΑΜ: {totals['allocated_am']}, "
+        f"μη κατανεμημένοι ΑΜ: {totals['unallocated_am']} -> {summary_path}",
+        file=sys.stderr,
+    )
+    return 0 if totals["failed"] == 0 else 1
@@ -0,0 +1,25 @@
+# ------------------------------------------------
+# Διαγνωστικά μηνύματα εκτέλεσης
+# ------------------------------------------------
+# Ο πυρήνας δεν καλεί ποτέ UI. Επιστρέφει λίστα από dicts που τα εμφανίζει
+# όποιος τον καλεί (σελίδα Streamlit, CLI, API).
+
+ERROR = "error"
+WARNING = "warning"
+
+INVALID_WORKBOOK = "invalid_workbook"
+MISSING_COLUMNS = "missing_columns"
+PERIOD_PARSE_ERROR = "period_parse_error"
+CAPACITY_UNRESOLVED = "capacity_unresolved"
+INVALID_AM = "invalid_am"
+MISSING_VALUE = "missing_value"
+AM_EXCEEDS_PERIOD = "am_exceeds_period"
+NEGATIVE_AM = "negative_am"
+
+
+def diagnostic(level, code, message, **details):
+    return {"level": level, "code": code, "message": message, **details}
+
+
+def has_errors(diagnostics):
+    return any(d["level"] == ERROR for d in diagnostics)
@@ -0,0 +1,293 @@
+# ------------------------------------------------
+# Μηχανή κατανομής (χωρίς openpyxl)
+# ------------------------------------------------
+# Η κατανομή γίνεται εξ ολοκλήρου στη μνήμη. Το αποτέλεσμα αποδίδεται στο
+# φύλλο 'ΑΝΑΛΥΣΗ' με ένα μόνο πέρασμα εγγραφής, αφού ολοκληρωθούν όλα τα βήματα.
+#
+# Οι μήνες είναι ακέραιοι δείκτες (βλ. periods.month_index). Η κατάληψη των
+# μηνών και τα ετήσια σύνολα κρατιούνται σε λίστες με αφετηρία τον Ιανουάριο
+# του πρώτου έτους, και κάθε έργο ορίζεται από το διάστημα [start_idx, end_idx].
+
+import heapq
+
+from .diagnostics import CAPACITY_UNRESOLVED, WARNING, diagnostic
+from .flow import allocate_optimal
+from .periods import allocation_years
+from .progress import ENFORCE, PASS1, PASS2, report
+from .reasons import DEALLOCATED, MONTH_TAKEN, PASS2_YEAR_FULL, YEAR_FULL, log_reason, reasons_text
+
+MAX_YEARLY_CAPACITY = 11
+
+# Allocation order policies: name -> sort key of the project dicts
+ORDERS = {
+    # Yellow rows first, then the shortest periods
+    "yellow_short_first": lambda x: (not x["is_yellow"], x["months_in_period_count"]),
+    "yellow_long_first": lambda x: (not x["is_yellow"], -x["months_in_period_count"]),
+    "short_first": lambda x: x["months_in_period_count"],
+    "long_first": lambda x: -x["months_in_period_count"],
+    "input_order": lambda x: x["project_id"],
+}
+DEFAULT_ORDER = "yellow_short_first"
+
+
+def allocation_order(projects, order=DEFAULT_ORDER):
+    if order not in ORDERS:
+        raise ValueError(f"Unknown allocation order: '{order}'. Expected one of: {', '.join(ORDERS)}.")
+    return sorted(projects, key=ORDERS[order])
+
+
+def allocate(projects, max_yearly_capacity=MAX_YEARLY_CAPACITY, solver="greedy", progress=None,
+             order=DEFAULT_ORDER):
+    """Allocate the months of the parsed project dicts.
+
+    The project dicts are updated in place (``allocated_am``, ``unallocated_am``,
+    ``reasons_log`` with reason codes, see reasons). Returns a dict with the allocation order of the projects,
+    the final ``assignment`` (``month_idx -> project_id``), the yearly totals
+    and any warnings raised while enforcing the yearly capacity, plus the
+    solver's ``counters`` for the run report. ``progress``
+    is called with the name of each phase as it starts (see progress.PHASES);
+    ``order`` names the policy of ORDERS the projects are served in.
+    """
+    if solver not in SOLVERS:
+        raise ValueError(f"Unknown solver: '{solver}'. Expected one of: {', '.join(SOLVERS)}.")
+    return SOLVERS[solver](allocation_order(projects, order), max_yearly_capacity, progress)
+
+
+def _find_free(next_free, pos):
+    # Union-find with path halving: first month at or after pos that is still free
+    while next_free[pos] != pos:
+        next_free[pos] = next_free[next_free[pos]]
+        pos = next_free[pos]
+    return pos
+
+
+def allocate_greedy(data, max_yearly_capacity=MAX_YEARLY_CAPACITY, progress=None):
+    # Pass 1 in allocation order, Pass 2 for zero-allocated projects
+    # (donor stealing), then strict yearly capacity enforcement.
+    project_id_map = {proj["project_id"]: proj for proj in data}
+
+    years = allocation_years(data)
+    first_year = years[0] if years else 0
+    base = first_year * 12
+    span = (years[-1] - first_year + 1) * 12 if years else 0
+
+    owner = [None] * span
+    year_totals = [0] * (span // 12)
+    next_free = list(range(span + 1))
+    pass1_months = 0
+    pass2_placements = {"free_month": 0, "non_yellow_donor": 0, "yellow_donor": 0}
+
+    # ------------------------------------------------
+    # Greedy Allocation - Pass 1
+    # ------------------------------------------------
+    report(progress, PASS1)
+    for project_data in data:
+        original_am = project_data["original_am"]
+        project_id = project_data["project_id"]
+        allocated_count = 0
+        pos = project_data["start_idx"] - base
+        end = project_data["end_idx"] - base
+
+        while pos <= end and allocated_count < original_am:
+            y_off = pos // 12
+            year_end = min(end, y_off * 12 + 11)
+
+            if year_totals[y_off] >= max_yearly_capacity:
+                log_reason(project_data, YEAR_FULL, first_year + y_off)
+                pos = year_end + 1
+                continue
+
+            free = _find_free(next_free, pos)
+            if free > pos:
+                for taken in range(pos, min(free, year_end + 1)):
+                    log_reason(project_data, MONTH_TAKEN, taken + base, owner[taken])
+                pos = min(free, year_end + 1)
+                continue
+
+            owner[pos] = project_id
+            next_free[pos] = pos + 1
+            year_totals[y_off] += 1
+            allocated_count += 1
+            pos += 1
+
+        project_data["allocated_am"] = allocated_count
+        project_data["unallocated_am"] = original_am - allocated_count
+        pass1_months += allocated_count
+
+    # ------------------------------------------------
+    # Greedy Allocation - Pass 2: Enforcement for zero-allocated projects
+    # ------------------------------------------------
+    report(progress, PASS2)
+    projects_that_got_allocated_in_pass2 = set()
+
+    for project_data in data:
+        if project_data["allocated_am"] == 0 and project_data["original_am"] > 0:
+            current_project_id = project_data["project_id"]
+            start = project_data["start_idx"] - base
+            end = project_data["end_idx"] - base
+            found_allocation_in_pass2 = False
+            project_data["reasons_log"] = {}
+
+            pos = _find_free(next_free, start) if start <= end else end + 1
+            while pos <= end:
+                y_off = pos // 12
+                if year_totals[y_off] >= max_yearly_capacity:
+                    log_reason(project_data, PASS2_YEAR_FULL, first_year + y_off)
+                    pos = _find_free(next_free, y_off * 12 + 12)
+                    continue
+
+                owner[pos] = current_project_id
+                next_free[pos] = pos + 1
+                year_totals[y_off] += 1
+                project_data["allocated_am"] += 1
+                project_data["unallocated_am"] -= 1
+
+                found_allocation_in_pass2 = True
+                projects_that_got_allocated_in_pass2.add(current_project_id)
+                pass2_placements["free_month"] += 1
+                break
+
+            if found_allocation_in_pass2:
+                continue
+
+            # Attempt 2: take the month from a non-yellow donor, Attempt 3: from any donor
+            for yellow_donors_allowed in (False, True):
+                for pos in range(start, end + 1):
+                    occupying_project_id = owner[pos]
+                    if occupying_project_id is not None and occupying_project_id != current_project_id:
+                        donor_project = project_id_map.get(occupying_project_id)
+                        if (
+                            donor_project
+                            and (yellow_donors_allowed or not donor_project["is_yellow"])
+                            and donor_project["allocated_am"] > 1
+                        ):
+                            donor_project["allocated_am"] -= 1
+                            donor_project["unallocated_am"] += 1
+                            owner[pos] = current_project_id
+                            project_data["allocated_am"] += 1
+                            project_data["unallocated_am"] -= 1
+
+                            found_allocation_in_pass2 = True
+                            projects_that_got_allocated_in_pass2.add(current_project_id)
+                            pass2_placements["yellow_donor" if yellow_donors_allowed else "non_yellow_donor"] += 1
+                            break
+
+                if found_allocation_in_pass2:
+                    break
+
+    # ------------------------------------------------
+    # Post-processing: Enforce strict yearly capacity
+    # ------------------------------------------------
+    report(progress, ENFORCE)
+    capacity_deallocations = {}
+    warnings = enforce_yearly_capacity(
+        years, owner, year_totals, project_id_map, projects_that_got_allocated_in_pass2, max_yearly_capacity,
+        deallocations=capacity_deallocations,
+    )
+
+    assignment = {pos + base: pid for pos, pid in enumerate(owner) if pid is not None}
+
+    return {
+        "projects": data,
+        "years": years,
+        "assignment": assignment,
+        "yearly_am_totals": {y: year_totals[y - first_year] for y in years},
+        "max_yearly_capacity": max_yearly_capacity,
+        "warnings": warnings,
+        "counters": {
+            "pass1_months": pass1_months,
+            "pass2_placements": pass2_placements,
+            "capacity_deallocations": capacity_deallocations,
+        },
+    }
+
+
+def _deallocation_tier(project_info, pass2_project_ids):
+    # Lower tiers give up their months first:
+    # 0 non-yellow with more than one month, not placed by Pass 2
+    # 1 non-yellow with more than one month
+    # 2 any project with more than one month
+    # 3 any project
+    if project_info["allocated_am"] > 1:
+        if project_info["is_yellow"]:
+            return 2
+        return 1 if project_info["project_id"] in pass2_project_ids else 0
+    return 3
+
+
+def enforce_yearly_capacity(years, owner, year_totals, project_id_map, pass2_project_ids, max_yearly_capacity,
+                            deallocations=None):
+    """Deallocate months until no year exceeds ``max_yearly_capacity``.
+
+    ``owner`` and ``year_totals`` are the list-backed grids of the greedy solver,
+    starting at January of ``years[0]``. Within a year the month with the lowest
+    (tier, month) key is removed first, which is the same month the tiered
+    linear scans picked. Tiers only grow while months are removed, so stale heap
+    entries are re-pushed with their current tier when popped. Returns the
+    warning diagnostics for years that could not be brought under the limit.
+    If given, ``deallocations`` receives the number of months removed per year.
+    """
+    warnings = []
+    first_year = years[0] if years else 0
+
+    for y in years:
+        y_off = y - first_year
+        if year_totals[y_off] <= max_yearly_capacity:
+            continue
+
+        heap = []
+        for pos in range(y_off * 12, y_off * 12 + 12):
+            project_info = project_id_map.get(owner[pos]) if owner[pos] is not None else None
+            if project_info:
+                heap.append((_deallocation_tier(project_info, pass2_project_ids), pos))
+        heapq.heapify(heap)
+
+        while year_totals[y_off] > max_yearly_capacity:
+            if not heap:
+                warnings.append(diagnostic(
+                    WARNING, CAPACITY_UNRESOLVED,
+                    f"Warning: No suitable month could be deallocated in year {y} to meet capacity "
+                    f"(total: {year_totals[y_off]}). All remaining allocations might be protected by rules.",
+                    year=y, total=year_totals[y_off],
+                ))
+                break
+
+            tier, pos = heapq.heappop(heap)
+            donor_project = project_id_map[owner[pos]]
+            current_tier = _deallocation_tier(donor_project, pass2_project_ids)
+            if current_tier != tier:
+                heapq.heappush(heap, (current_tier, pos))
+                continue
+
+            owner[pos] = None
+            year_totals[y_off] -= 1
+            donor_project["allocated_am"] -= 1
+            donor_project["unallocated_am"] += 1
+
+            log_reason(donor_project, DEALLOCATED, y * 12 + pos % 12)
+            if deallocations is not None:
+                deallocations[y] = deallocations.get(y, 0) + 1
+
+    return warnings
+
+
+SOLVERS = {
+    "greedy": allocate_greedy,
+    "optimal": allocate_optimal,
+}
+
+
+def unallocated_report(projects, language="en"):
+    """Projects with unallocated AM; their reason messages are rendered here only."""
+    unallocated_projects = []
+    for project_data in projects:
+        if project_data["unallocated_am"] > 0:
+            unallocated_projects.append({
+                "period": project_data["period_str"],
+                "original_am": project_data["original_am"],
+                "allocated_am": project_data["allocated_am"],
+                "unallocated_am": project_data["unallocated_am"],
+                "reasons": reasons_text(project_data["reasons_log"], language),
+                "reason_codes": [list(reason) for reason in project_data["reasons_log"]],
+            })
+    return unallocated_projects
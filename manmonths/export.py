@@ -0,0 +1,141 @@
+# ------------------------------------------------
+# Εξαγωγή μόνο δεδομένων (JSON / CSV, χωρίς xlsx)
+# ------------------------------------------------
+# Για συστήματα που χρειάζονται μόνο τον πίνακα κατανομής: το INPUT διαβάζεται
+# χωρίς το φύλλο 'CV', γίνεται η κατανομή και επιστρέφονται η ανάθεση
+# μήνας -> έργο, τα ετήσια σύνολα και τα μη κατανεμημένα έργα. Το template δεν
+# ανοίγει και δεν δημιουργείται workbook.
+
+import csv
+import io
+import json
+
+from .diagnostics import ERROR, MISSING_COLUMNS, diagnostic
+from .engine import DEFAULT_ORDER, MAX_YEARLY_CAPACITY, allocate, unallocated_report
+from .incremental import allocate_incremental
+from .periods import month_from_index
+from .pipeline import build_projects, failed_result, new_counters, run_report
+from .progress import PARSE, SAVE, PhaseTimer
+from .reader import read_input
+
+
+def month_label(month_idx):
+    y, m = month_from_index(month_idx)
+    return f"{y}-{m:02d}"
+
+
+def allocation_data(allocation):
+    """JSON-ready view of an allocate() result: projects in INPUT order and their months."""
+    projects = allocation["projects"]
+    months_by_project = {}
+    for month_idx, project_id in sorted(allocation["assignment"].items()):
+        months_by_project.setdefault(project_id, []).append(month_label(month_idx))
+
+    max_yearly_capacity = allocation["max_yearly_capacity"]
+    yearly_am_totals = allocation["yearly_am_totals"]
+    return {
+        "max_yearly_capacity": max_yearly_capacity,
+        "projects": [
+            {
+                "project_id": proj["project_id"],
+                "input_row": proj["input_row"],
+                "period": proj["period_str"],
+                "is_yellow": proj["is_yellow"],
+                "original_am": proj["original_am"],
+                "allocated_am": proj["allocated_am"],
+                "unallocated_am": proj["unallocated_am"],
+                "months": months_by_project.get(proj["project_id"], []),
+            }
+            for proj in sorted(projects, key=lambda p: p["project_id"])
+        ],
+        "assignment": {
+            month_label(month_idx): project_id for month_idx, project_id in sorted(allocation["assignment"].items())
+        },
+        "yearly_am_totals": {str(y): total for y, total in sorted(yearly_am_totals.items())},
+        "yearly_overages": {
+            str(y): total - max_yearly_capacity
+            for y, total in sorted(yearly_am_totals.items()) if total > max_yearly_capacity
+        },
+        "unallocated_projects": unallocated_report(projects),
+    }
+
+
+def allocate_data(uploaded_input_file, solver="greedy", max_yearly_capacity=MAX_YEARLY_CAPACITY, progress=None,
+                  order=DEFAULT_ORDER, state=None):
+    """Allocate one INPUT workbook without rendering it.
+
+    Returns the same dict as process_excel_data, except that ``output`` is the
+    allocation_data() dict instead of an xlsx buffer. ``state`` works as in
+    process_excel_data.
+    """
+    diagnostics = []
+    timer = PhaseTimer(progress)
+    counters = new_counters()
+
+    timer(PARSE)
+    try:
+        source = read_input(uploaded_input_file, cv_columns=())
+    except ValueError as e:
+        diagnostics.append(diagnostic(ERROR, MISSING_COLUMNS, str(e)))
+        return failed_result(diagnostics, timer, counters)
+
+    data = build_projects(source["rows"], diagnostics, counters)
+    if state is None:
+        allocation = allocate(data, max_yearly_capacity, solver=solver, progress=timer, order=order)
+    else:
+        allocation = allocate_incremental(
+            data, state, max_yearly_capacity, solver=solver, progress=timer, order=order,
+        )
+    diagnostics.extend(allocation["warnings"])
+    counters.update(allocation["counters"])
+
+    timer(SAVE)
+    output = allocation_data(allocation)
+
+    return {
+        "output": output,
+        "unallocated_projects": output["unallocated_projects"],
+        "yearly_am_totals": allocation["yearly_am_totals"],
+        "yearly_overages": {int(y): over for y, over in output["yearly_overages"].items()},
+        "max_yearly_capacity": max_yearly_capacity,
+        "diagnostics": diagnostics,
+        "report": run_report(timer, counters),
+        "state": allocation.get("state"),
+    }
+
+
+def to_json(output):
+    return json.dumps(output, ensure_ascii=False, indent=2)
+
+
+def csv_tables(output):
+    """Split allocation_data() into flat tables: name -> (header, rows)."""
+    projects = {proj["project_id"]: proj for proj in output["projects"]}
+    return {
+        "assignment": (
+            ["month", "project_id", "input_row", "period"],
+            [
+                [month, project_id, projects[project_id]["input_row"], projects[project_id]["period"]]
+                for month, project_id in output["assignment"].items()
+            ],
+        ),
+        "yearly_totals": (
+            ["year", "allocated_am", "overage"],
+            [[y, total, output["yearly_overages"].get(y, 0)] for y, total in output["yearly_am_totals"].items()],
+        ),
+        "unallocated": (
+            ["period", "original_am", "allocated_am", "unallocated_am", "reasons"],
+            [
+                [proj["period"], proj["original_am"], proj["allocated_am"], proj["unallocated_am"], proj["reasons"]]
+                for proj in output["unallocated_projects"]
+            ],
+        ),
+    }
+
+
+def to_csv(header, rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    writer.writerows(rows)
+    return buffer.getvalue()
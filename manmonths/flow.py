@@ -0,0 +1,142 @@
+# ------------------------------------------------
+# Βέλτιστη κατανομή (max-flow)
+# ------------------------------------------------
+# Δίκτυο ροής: πηγή -> έργο (χωρητικότητα original_am) -> μήνας της περιόδου
+# (χωρητικότητα 1) -> έτος -> καταβόθρα (χωρητικότητα MAX_YEARLY_CAPACITY).
+#
+# Οι αυξητικές διαδρομές ξεκινούν από ένα έργο τη φορά, με την ίδια σειρά
+# προτεραιότητας όπως ο greedy αλγόριθμος. Μια αύξηση δεν μειώνει ποτέ τη ροή
+# ενός έργου που έχει ήδη εξυπηρετηθεί, οπότε η κατανομή είναι λεξικογραφική:
+#   1. κίτρινα έργα, πλήρης ζήτηση
+#   2. υπόλοιπα έργα, ένας μήνας το καθένα (όπως το Pass 2 του greedy)
+#   3. υπόλοιπα έργα, πλήρης ζήτηση
+# και στο τέλος δεν υπάρχει αυξητική διαδρομή, άρα η ροή είναι μέγιστη.
+
+from collections import deque
+
+from .periods import allocation_years
+from .progress import PASS1, PASS2, report
+from .reasons import MONTH_TAKEN, YEAR_FULL, log_reason
+
+
+def _augment(start_pid, months_of, owner, base, yearly_am_totals, max_yearly_capacity):
+    # BFS on the residual graph. Project -> month edges are open for every month
+    # the project does not hold; a taken month leads back to its owner, a free
+    # month leads to its year; a full year leads back to its allocated months.
+    # Months are absolute indices, owner is a list starting at month index base.
+    # Returns the number of months on the path (1 for a free month), 0 if none.
+    parent = {("p", start_pid): None}
+    queue = deque([("p", start_pid)])
+
+    while queue:
+        node = queue.popleft()
+        kind, key = node
+
+        if kind == "p":
+            for month_idx in months_of[key]:
+                nxt = ("m", month_idx)
+                if owner[month_idx - base] != key and nxt not in parent:
+                    parent[nxt] = node
+                    queue.append(nxt)
+
+        elif kind == "m":
+            if owner[key - base] is not None:
+                nxt = ("p", owner[key - base])
+            else:
+                nxt = ("y", key // 12)
+            if nxt not in parent:
+                parent[nxt] = node
+                queue.append(nxt)
+
+        else:
+            if yearly_am_totals[key] < max_yearly_capacity:
+                return _apply_path(node, parent, owner, base, yearly_am_totals)
+            for month_idx in range(key * 12, key * 12 + 12):
+                nxt = ("m", month_idx)
+                if owner[month_idx - base] is not None and nxt not in parent:
+                    parent[nxt] = node
+                    queue.append(nxt)
+
+    return 0
+
+
+def _apply_path(year_node, parent, owner, base, yearly_am_totals):
+    yearly_am_totals[year_node[1]] += 1
+    months = 0
+    node = year_node
+    while parent[node] is not None:
+        prev = parent[node]
+        if node[0] == "m":
+            months += 1
+            if prev[0] == "p":
+                owner[node[1] - base] = prev[1]
+            elif prev[0] == "y":
+                owner[node[1] - base] = None
+        node = prev
+    return months
+
+
+def allocate_optimal(data, max_yearly_capacity, progress=None):
+    years = allocation_years(data)
+    yearly_am_totals = {year: 0 for year in years}
+    months_of = {proj["project_id"]: range(proj["start_idx"], proj["end_idx"] + 1) for proj in data}
+    base = years[0] * 12 if years else 0
+    owner = [None] * ((years[-1] - years[0] + 1) * 12 if years else 0)
+
+    for proj in data:
+        proj["allocated_am"] = 0
+        proj["reasons_log"] = {}
+
+    # Same keys as the greedy solver: how the months after Pass 1 were placed
+    pass2_placements = {"free_month": 0, "rerouted": 0}
+
+    def serve(proj, demand, placements=None):
+        while proj["allocated_am"] < min(demand, len(months_of[proj["project_id"]])):
+            months = _augment(proj["project_id"], months_of, owner, base, yearly_am_totals, max_yearly_capacity)
+            if not months:
+                break
+            proj["allocated_am"] += 1
+            if placements is not None:
+                placements["free_month" if months == 1 else "rerouted"] += 1
+
+    # Pass 1: yellow projects; Pass 2: everything else (there is no enforcement step)
+    report(progress, PASS1)
+    for proj in data:
+        if proj["is_yellow"]:
+            serve(proj, proj["original_am"])
+    report(progress, PASS2)
+    pass1_months = sum(proj["allocated_am"] for proj in data)
+    for proj in data:
+        if not proj["is_yellow"]:
+            # A negative AM asks for nothing
+            serve(proj, min(1, proj["original_am"]), pass2_placements)
+    for proj in data:
+        if not proj["is_yellow"]:
+            serve(proj, proj["original_am"], pass2_placements)
+
+    assignment = {pos + base: pid for pos, pid in enumerate(owner) if pid is not None}
+
+    for proj in data:
+        proj["unallocated_am"] = proj["original_am"] - proj["allocated_am"]
+        if proj["unallocated_am"] > 0:
+            for month_idx in months_of[proj["project_id"]]:
+                y = month_idx // 12
+                if yearly_am_totals[y] >= max_yearly_capacity:
+                    log_reason(proj, YEAR_FULL, y)
+                elif assignment.get(month_idx, proj["project_id"]) != proj["project_id"]:
+                    log_reason(proj, MONTH_TAKEN, month_idx, assignment[month_idx])
+
+    return {
+        "projects": data,
+        "years": years,
+        "assignment": assignment,
+        "yearly_am_totals": yearly_am_totals,
+        "max_yearly_capacity": max_yearly_capacity,
+        "warnings": [],
+        "counters": {
+            "pass1_months": pass1_months,
+            "pass2_placements": pass2_placements,
+            # There is no enforcement step
+            "capacity_deallocations": {},
+        },
+    }
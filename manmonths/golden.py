@@ -0,0 +1,437 @@
+# ------------------------------------------------
+# Διαφορικός έλεγχος μηχανών κατανομής (golden corpus)
+# ------------------------------------------------
+# python -m manmonths.golden [--engine manmonths.engine:allocate_greedy] [--invariants-only] [--cases 200] [--seed 0]
+#                            [--enforce manmonths.engine:enforce_yearly_capacity] [--family dense] [--sizes 100 1000 5000] [--repeat 3] [--json out.json]
+#
+# Κάθε νέα ή ταχύτερη μηχανή κατανομής (ίδια υπογραφή με τους solvers του
+# engine.SOLVERS) συγκρίνεται με την παγωμένη αρχική κατανομή (βλ. reference),
+# που διαβάζει τις ίδιες γραμμές INPUT με τις δικές της συναρτήσεις ημερομηνιών.
+# Το corpus είναι ντετερμινιστικό: για κάθε οικογένεια INPUT (ανάμεικτα, πυκνά,
+# μόνο κίτρινα, ΑΜ πάνω από τη διάρκεια, περίεργες περίοδοι, ...) και κάθε seed
+# παράγονται γραμμές INPUT, μια χωρητικότητα και μια σειρά κατανομής. Για κάθε
+# περίπτωση ελέγχονται ίδια ανάθεση μηνών, ετήσια σύνολα, ΑΜ ανά έργο, λόγοι
+# και προειδοποιήσεις, καθώς και οι αναλλοίωτες της κατανομής. Ο έλεγχος
+# ετήσιας χωρητικότητας συγκρίνεται και μόνος του, σε τυχαία υπερπλήρη έτη,
+# γιατί τα περάσματα της greedy δεν ξεπερνούν ποτέ τη χωρητικότητα. Στο τέλος
+# μετριέται ο λόγος ταχύτητας αναφοράς / μηχανής (ανάλυση περιόδων και
+# κατανομή) ανά μέγεθος INPUT.
+
+import argparse
+import copy
+import importlib
+import json
+import random
+import re
+import statistics
+import sys
+import time
+
+from .diagnostics import CAPACITY_UNRESOLVED, PERIOD_PARSE_ERROR
+from .engine import MAX_YEARLY_CAPACITY, ORDERS, allocation_order
+from .pipeline import build_projects, new_counters
+from .reasons import reason_message
+from .reference import reference_allocate, reference_enforce
+
+DEFAULT_ENGINE = "manmonths.engine:allocate_greedy"
+DEFAULT_ENFORCE = "manmonths.engine:enforce_yearly_capacity"
+DEFAULT_SIZES = (100, 1000, 5000)
+
+_SKIPPED_ROW_RE = re.compile(r"^Skipping row (\d+) ")
+
+# rows, (min, max) period length in months, (first, last) year, yellow ratio,
+# AM as a share of the period length, share of rows repeating an earlier period,
+# share of odd rows (reversed periods, negative AM, whole-year, 'Σήμερα' and invalid periods)
+FAMILIES = {
+    "mixed": {"rows": (5, 80), "span": (1, 48), "years": (2000, 2024), "yellow_ratio": 0.25, "am_scale": 1.0,
+              "duplicate_ratio": 0.1, "odd_ratio": 0.0},
+    # Few years, many projects: Pass 2 takes most months from donors
+    "dense": {"rows": (20, 120), "span": (1, 24), "years": (2018, 2021), "yellow_ratio": 0.25, "am_scale": 1.0,
+              "duplicate_ratio": 0.2, "odd_ratio": 0.0},
+    "all_yellow": {"rows": (5, 80), "span": (1, 36), "years": (2010, 2020), "yellow_ratio": 1.0, "am_scale": 1.0,
+                   "duplicate_ratio": 0.1, "odd_ratio": 0.0},
+    "no_yellow": {"rows": (5, 80), "span": (1, 36), "years": (2010, 2020), "yellow_ratio": 0.0, "am_scale": 1.0,
+                  "duplicate_ratio": 0.1, "odd_ratio": 0.0},
+    "single_months": {"rows": (5, 80), "span": (1, 2), "years": (2015, 2020), "yellow_ratio": 0.3, "am_scale": 1.0,
+                      "duplicate_ratio": 0.3, "odd_ratio": 0.0},
+    "long_periods": {"rows": (5, 40), "span": (24, 180), "years": (1990, 2024), "yellow_ratio": 0.25,
+                     "am_scale": 1.0, "duplicate_ratio": 0.0, "odd_ratio": 0.0},
+    "overbooked": {"rows": (5, 60), "span": (1, 36), "years": (2010, 2020), "yellow_ratio": 0.25, "am_scale": 2.5,
+                   "duplicate_ratio": 0.1, "odd_ratio": 0.0},
+    "odd": {"rows": (5, 60), "span": (1, 36), "years": (2015, 2024), "yellow_ratio": 0.25, "am_scale": 1.0,
+            "duplicate_ratio": 0.1, "odd_ratio": 0.3},
+}
+
+
+def _month_text(month_idx):
+    return f"{month_idx % 12 + 1:02d}/{month_idx // 12}"
+
+
+def random_rows(rnd, rows, span, years, yellow_ratio, am_scale, duplicate_ratio, odd_ratio):
+    """INPUT rows as reader.read_input returns them, for build_projects."""
+    result = []
+    for r in range(2, rows + 2):
+        if result and rnd.random() < duplicate_ratio:
+            period = rnd.choice(result)["period"]
+            months = None
+        else:
+            start = rnd.randint(years[0] * 12, years[1] * 12 + 11)
+            end = min(start + rnd.randint(*span) - 1, years[1] * 12 + 11)
+            months = end - start + 1
+            # A lone 'MM/YYYY' is one of the formats added after the original code, which rejects it
+            period = f"{_month_text(start)} - {_month_text(end)}"
+
+        am = rnd.randint(1, max(1, round((months or 12) * am_scale)))
+        if rnd.random() < odd_ratio:
+            kind = rnd.randrange(5)
+            if kind == 0:
+                period = f"{_month_text(end)} - {_month_text(start)}" if months else period
+            elif kind == 1:
+                am = -am
+            elif kind == 2:
+                period = str(rnd.randint(*years))
+            elif kind == 3:
+                period = f"{_month_text(rnd.randint(years[1] * 12 - 24, years[1] * 12 + 11))} - Σήμερα"
+            else:
+                period = f"13/{rnd.randint(*years)} - 12/{years[1]}"
+        result.append({"row": r, "period": period, "am_raw": am, "is_yellow": rnd.random() < yellow_ratio})
+    return result
+
+
+def golden_case(family, seed):
+    """The deterministic case ``seed`` of ``family``: INPUT rows, capacity and order."""
+    params = FAMILIES[family]
+    rnd = random.Random(f"{family}-{seed}")
+    rows = random_rows(rnd, rnd.randint(*params["rows"]), **{k: v for k, v in params.items() if k != "rows"})
+    return {
+        "family": family,
+        "seed": seed,
+        "rows": rows,
+        "max_yearly_capacity": rnd.randint(1, 12),
+        "order": rnd.choice(list(ORDERS)),
+    }
+
+
+def load_engine(spec):
+    """Import an engine given as 'module:function'."""
+    module_name, _, function_name = spec.partition(":")
+    return getattr(importlib.import_module(module_name), function_name)
+
+
+def run_engine(engine, rows, max_yearly_capacity, order):
+    """Parse ``rows`` and allocate them with ``engine``; returns the allocation and the parse diagnostics."""
+    diagnostics = []
+    projects = build_projects(rows, diagnostics, new_counters())
+    return engine(allocation_order(projects, order), max_yearly_capacity), diagnostics
+
+
+def run_reference(rows, max_yearly_capacity, order):
+    return reference_allocate(rows, max_yearly_capacity, sort_key=ORDERS[order])
+
+
+def engine_outcome(allocation, diagnostics=()):
+    # Reasons and warnings as the messages the user reads. The period errors
+    # are compared by row: their text lists the date formats, which have grown
+    return {
+        "assignment": dict(allocation["assignment"]),
+        "yearly_am_totals": dict(allocation["yearly_am_totals"]),
+        "projects": {
+            p["project_id"]: (p["allocated_am"], p["unallocated_am"], [reason_message(r) for r in p["reasons_log"]])
+            for p in allocation["projects"]
+        },
+        "skipped_rows": [diag["row"] for diag in diagnostics if diag["code"] == PERIOD_PARSE_ERROR],
+        "warnings": [diag["message"] for diag in allocation["warnings"]],
+    }
+
+
+def reference_outcome(result):
+    # (year, month) keys of the reference as month indices of the engine
+    return {
+        "assignment": {
+            y * 12 + m - 1: project_id
+            for (y, m), project_id in result["month_allocation_status"].items() if project_id is not None
+        },
+        "yearly_am_totals": dict(result["yearly_am_totals"]),
+        "projects": {
+            p["project_id"]: (p["allocated_am"], p["unallocated_am"], list(p["reasons_log"]))
+            for p in result["projects"]
+        },
+        "skipped_rows": [int(match.group(1)) for match in map(_SKIPPED_ROW_RE.match, result["warnings"]) if match],
+        "warnings": [message for message in result["warnings"] if not _SKIPPED_ROW_RE.match(message)],
+    }
+
+
+def differences(expected, actual):
+    """What ``actual`` does differently from ``expected`` (both outcomes); empty if nothing."""
+    found = []
+    months = sorted(set(expected["assignment"]) | set(actual["assignment"]))
+    wrong_months = [m for m in months if expected["assignment"].get(m) != actual["assignment"].get(m)]
+    if wrong_months:
+        m = wrong_months[0]
+        found.append(
+            f"assignment: {len(wrong_months)} months differ, first {_month_text(m)}: "
+            f"project {expected['assignment'].get(m)} expected, {actual['assignment'].get(m)} found"
+        )
+    if expected["yearly_am_totals"] != actual["yearly_am_totals"]:
+        found.append(f"yearly totals: {expected['yearly_am_totals']} expected, {actual['yearly_am_totals']} found")
+    for project_id, (allocated, unallocated, reasons) in expected["projects"].items():
+        got = actual["projects"].get(project_id)
+        if got is None:
+            found.append(f"project {project_id}: missing")
+        elif (allocated, unallocated) != got[:2]:
+            found.append(f"project {project_id}: AM {allocated}/{unallocated} expected, {got[0]}/{got[1]} found")
+        elif reasons != got[2]:
+            found.append(f"project {project_id}: reasons {reasons} expected, {got[2]} found")
+    extra = sorted(set(actual["projects"]) - set(expected["projects"]))
+    if extra:
+        found.append(f"projects {extra}: not in the reference")
+    if expected["skipped_rows"] != actual["skipped_rows"]:
+        found.append(f"skipped rows: {expected['skipped_rows']} expected, {actual['skipped_rows']} found")
+    if expected["warnings"] != actual["warnings"]:
+        found.append(f"warnings: {expected['warnings']} expected, {actual['warnings']} found")
+    return found
+
+
+def invariant_violations(allocation):
+    """Properties every allocation must have, whatever the engine."""
+    found = []
+    cap = allocation["max_yearly_capacity"]
+    projects = {p["project_id"]: p for p in allocation["projects"]}
+    months_by_project = {}
+    months_by_year = {}
+    for month_idx, project_id in allocation["assignment"].items():
+        months_by_project[project_id] = months_by_project.get(project_id, 0) + 1
+        months_by_year[month_idx // 12] = months_by_year.get(month_idx // 12, 0) + 1
+        proj = projects.get(project_id)
+        if proj is None or not proj["start_idx"] <= month_idx <= proj["end_idx"]:
+            found.append(f"{_month_text(month_idx)} given to project {project_id} outside its period")
+
+    for project_id, proj in projects.items():
+        if proj["allocated_am"] != months_by_project.get(project_id, 0):
+            found.append(f"project {project_id}: allocated_am {proj['allocated_am']} but "
+                         f"{months_by_project.get(project_id, 0)} months")
+        if proj["allocated_am"] + proj["unallocated_am"] != proj["original_am"]:
+            found.append(f"project {project_id}: allocated + unallocated != original AM")
+        if not 0 <= proj["allocated_am"] <= max(proj["original_am"], 0):
+            found.append(f"project {project_id}: allocated_am {proj['allocated_am']} outside "
+                         f"0..{max(proj['original_am'], 0)}")
+
+    unresolved = {w["year"] for w in allocation["warnings"] if w["code"] == CAPACITY_UNRESOLVED}
+    for year, total in allocation["yearly_am_totals"].items():
+        if total != months_by_year.get(year, 0):
+            found.append(f"year {year}: total {total} but {months_by_year.get(year, 0)} months")
+        if total > cap and year not in unresolved:
+            found.append(f"year {year}: {total} over the capacity {cap} without a warning")
+    return found
+
+
+def differential(engine, cases=200, seed=0, families=None, invariants_only=False):
+    """Run ``cases`` seeds of every family through the reference and ``engine``.
+
+    With ``invariants_only`` the reference is not run and ``engine`` is only
+    checked against invariant_violations, for engines that allocate
+    differently on purpose (such as flow.allocate_optimal). Returns a dict with the number of ``cases`` run and the ``failures``
+    (family, seed, capacity, order and what went wrong), to replay with
+    golden_case(family, seed).
+    """
+    failures = []
+    run = 0
+    for family in families or list(FAMILIES):
+        for case_seed in range(seed, seed + cases):
+            case = golden_case(family, case_seed)
+            actual, diagnostics = run_engine(engine, case["rows"], case["max_yearly_capacity"], case["order"])
+            problems = invariant_violations(actual)
+            if not invariants_only:
+                expected = run_reference(case["rows"], case["max_yearly_capacity"], case["order"])
+                problems = differences(reference_outcome(expected), engine_outcome(actual, diagnostics)) + problems
+            run += 1
+            if problems:
+                failures.append({
+                    "family": family,
+                    "seed": case_seed,
+                    "rows": len(case["rows"]),
+                    "max_yearly_capacity": case["max_yearly_capacity"],
+                    "order": case["order"],
+                    "problems": problems,
+                })
+    return {"cases": run, "failures": failures}
+
+
+def enforcement_case(seed):
+    """Over-full years for the capacity enforcement alone.
+
+    The greedy passes never exceed the capacity, so the tiers of the
+    enforcement are only reached through grids built here: random owners per
+    month, yellow flags, Pass 2 projects and months outside these years that
+    still count towards ``allocated_am``.
+    """
+    rnd = random.Random(f"enforce-{seed}")
+    first_year = rnd.randint(2000, 2020)
+    years = list(range(first_year, first_year + rnd.randint(1, 4)))
+    projects = [
+        {"project_id": project_id, "is_yellow": rnd.random() < 0.3, "allocated_am": rnd.choice((0, 0, 1, 5)),
+         "reasons_log": {}}
+        for project_id in range(rnd.randint(1, 15))
+    ]
+    fill = rnd.random()
+    owners = {}
+    for month_idx in range(years[0] * 12, years[-1] * 12 + 12):
+        if rnd.random() < fill:
+            owners[month_idx] = rnd.randrange(len(projects))
+            projects[owners[month_idx]]["allocated_am"] += 1
+    for proj in projects:
+        proj["original_am"] = proj["allocated_am"] + rnd.randint(0, 3)
+        proj["unallocated_am"] = proj["original_am"] - proj["allocated_am"]
+    return {
+        "seed": seed,
+        "years": years,
+        "owners": owners,
+        "projects": projects,
+        "pass2_project_ids": {proj["project_id"] for proj in projects if rnd.random() < 0.3},
+        "max_yearly_capacity": rnd.randint(1, 12),
+    }
+
+
+def _enforced(case, enforce=None):
+    # Run the reference (enforce=None) or the list-backed ``enforce`` of the engine on a copy of ``case``
+    projects = copy.deepcopy(case["projects"])
+    project_id_map = {proj["project_id"]: proj for proj in projects}
+    years = case["years"]
+    base = years[0] * 12
+    owner = [case["owners"].get(month_idx) for month_idx in range(base, years[-1] * 12 + 12)]
+    year_totals = [sum(1 for pid in owner[pos:pos + 12] if pid is not None) for pos in range(0, len(owner), 12)]
+
+    if enforce is None:
+        # The (year, month) grids and the list reasons of the original code
+        for proj in projects:
+            proj["reasons_log"] = []
+        month_allocation_status = {(y, m): owner[(y - years[0]) * 12 + m - 1] for y in years for m in range(1, 13)}
+        yearly_am_totals = dict(zip(years, year_totals))
+        warnings = reference_enforce(years, dict.fromkeys(month_allocation_status), month_allocation_status,
+                                     yearly_am_totals, project_id_map, case["pass2_project_ids"],
+                                     case["max_yearly_capacity"])
+        return reference_outcome({
+            "projects": projects,
+            "month_allocation_status": month_allocation_status,
+            "yearly_am_totals": yearly_am_totals,
+            "warnings": warnings,
+        })
+
+    warnings = enforce(years, owner, year_totals, project_id_map, case["pass2_project_ids"],
+                       case["max_yearly_capacity"])
+    return engine_outcome({
+        "projects": projects,
+        "assignment": {base + pos: pid for pos, pid in enumerate(owner) if pid is not None},
+        "yearly_am_totals": dict(zip(years, year_totals)),
+        "warnings": warnings,
+    })
+
+
+def enforcement_differential(enforce, cases=200, seed=0):
+    """Compare ``enforce`` (engine.enforce_yearly_capacity's signature) with the reference."""
+    failures = []
+    for case_seed in range(seed, seed + cases):
+        case = enforcement_case(case_seed)
+        problems = differences(_enforced(case), _enforced(case, enforce))
+        if problems:
+            failures.append({
+                "family": "enforce",
+                "seed": case_seed,
+                "rows": len(case["projects"]),
+                "max_yearly_capacity": case["max_yearly_capacity"],
+                "order": None,
+                "problems": problems,
+            })
+    return {"cases": cases, "failures": failures}
+
+
+def _timed(run, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples)
+
+
+def speed(engine, sizes=DEFAULT_SIZES, repeat=3, seed=0, family="mixed"):
+    """Median seconds of the reference and ``engine`` per INPUT size, and their ratio.
+
+    Both sides start from the INPUT rows, so the engine's time includes build_projects.
+    """
+    params = {k: v for k, v in FAMILIES[family].items() if k != "rows"}
+    # Keep the density of the family: the year range grows with the number of rows
+    first_year, last_year = params["years"]
+    results = []
+    for size in sizes:
+        rnd = random.Random(f"speed-{family}-{seed}-{size}")
+        years = (first_year, max(last_year, first_year + size // 20))
+        rows = random_rows(rnd, size, **dict(params, years=years))
+        reference_seconds = _timed(lambda: reference_allocate(rows, MAX_YEARLY_CAPACITY), repeat)
+        engine_seconds = _timed(
+            lambda: engine(allocation_order(build_projects(rows, [], new_counters())), MAX_YEARLY_CAPACITY), repeat,
+        )
+        results.append({
+            "rows": size,
+            "reference_seconds": reference_seconds,
+            "engine_seconds": engine_seconds,
+            "speedup": reference_seconds / engine_seconds if engine_seconds else float("inf"),
+        })
+    return results
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m manmonths.golden",
+                                     description="Σύγκριση μηχανής κατανομής με την αρχική κατανομή αναφοράς.")
+    parser.add_argument("--engine", default=DEFAULT_ENGINE,
+                        help=f"Μηχανή ως 'module:function' (default: {DEFAULT_ENGINE})")
+    parser.add_argument("--enforce", default=DEFAULT_ENFORCE,
+                        help=f"Έλεγχος ετήσιας χωρητικότητας ως 'module:function' (default: {DEFAULT_ENFORCE})")
+    parser.add_argument("--invariants-only", action="store_true",
+                        help="Μόνο οι αναλλοίωτες, χωρίς σύγκριση με την αναφορά (π.χ. για τη βέλτιστη κατανομή)")
+    parser.add_argument("--cases", type=int, default=200, help="Περιπτώσεις ανά οικογένεια (default: 200)")
+    parser.add_argument("--seed", type=int, default=0, help="Πρώτο seed του corpus")
+    parser.add_argument("--family", action="append", choices=list(FAMILIES),
+                        help="Οικογένεια INPUT (επαναλαμβανόμενο, default: όλες)")
+    parser.add_argument("--sizes", type=int, nargs="*", default=list(DEFAULT_SIZES),
+                        help="Μεγέθη INPUT (γραμμές) για τη μέτρηση ταχύτητας, κενό για καμία")
+    parser.add_argument("--repeat", type=int, default=3, help="Επαναλήψεις ανά μέγεθος (default: 3)")
+    parser.add_argument("--json", help="Αρχείο JSON για τα αποτελέσματα")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    engine = load_engine(args.engine)
+
+    result = differential(engine, cases=args.cases, seed=args.seed, families=args.family,
+                          invariants_only=args.invariants_only)
+    enforcement = enforcement_differential(load_engine(args.enforce), cases=args.cases, seed=args.seed)
+    result["cases"] += enforcement["cases"]
+    result["failures"] += enforcement["failures"]
+    for failure in result["failures"][:20]:
+        print(
+            f"FAIL {failure['family']} seed {failure['seed']} ({failure['rows']} γραμμές, "
+            f"χωρητικότητα {failure['max_yearly_capacity']}, {failure['order']}):",
+            file=sys.stderr,
+        )
+        for problem in failure["problems"][:5]:
+            print(f"  {problem}", file=sys.stderr)
+    print(f"{result['cases']} περιπτώσεις, {len(result['failures'])} διαφορές ({args.engine})", file=sys.stderr)
+
+    result["speed"] = speed(engine, args.sizes, args.repeat, args.seed) if args.sizes else []
+    for row in result["speed"]:
+        print(
+            f"{row['rows']:>6} γραμμές: αναφορά {row['reference_seconds'] * 1000:9.1f} ms, "
+            f"μηχανή {row['engine_seconds'] * 1000:9.1f} ms  ({row['speedup']:.1f}x)",
+            file=sys.stderr,
+        )
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+    return 1 if result["failures"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
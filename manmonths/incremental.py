@@ -0,0 +1,170 @@
+# ------------------------------------------------
+# Επαναληπτική κατανομή (αποθηκευμένη κατάσταση)
+# ------------------------------------------------
+# Τα έργα χωρίζονται σε ανεξάρτητες ομάδες: δύο έργα ανήκουν στην ίδια ομάδα
+# όταν οι περίοδοί τους (σε έτη) επικαλύπτονται, άμεσα ή μέσω άλλων
+# πολυετών έργων. Ούτε ο greedy ούτε ο βέλτιστος αλγόριθμος συνδέουν
+# διαφορετικές ομάδες (χωρητικότητα, μήνες, λόγοι και έλεγχος χωρητικότητας
+# είναι ανά έτος), οπότε το αποτέλεσμα μιας ομάδας που δεν άλλαξε μπορεί να
+# ξαναχρησιμοποιηθεί.
+#
+# Η κατάσταση είναι dict που σειριοποιείται σε JSON: για κάθε ομάδα, με κλειδί
+# το hash των έργων της με τη σειρά τους (περίοδος, ΑΜ, δείκτες μηνών, κίτρινο),
+# κρατιούνται οι μήνες, τα σύνολα, οι κωδικοί λόγων (βλ. reasons) και τα
+# διαγνωστικά. Το κλειδί δεν περιέχει τα project_id (αύξοντες αριθμοί), και τα
+# έργα που αναφέρουν οι λόγοι αποθηκεύονται ως θέση μέσα στην ομάδα, οπότε μια
+# γραμμή που προστίθεται ή αφαιρείται αλλού δεν ακυρώνει τις υπόλοιπες ομάδες.
+# Σε νέα εκτέλεση υπολογίζονται ξανά μόνο οι ομάδες που δεν υπάρχουν στην κατάσταση.
+
+import hashlib
+import json
+
+from .engine import DEFAULT_ORDER, MAX_YEARLY_CAPACITY, allocate, allocation_order
+from .periods import allocation_years
+from .reasons import MONTH_TAKEN
+
+STATE_VERSION = 3
+
+
+def components(projects):
+    """Group the projects whose year ranges are connected; groups keep input order."""
+    spans = sorted(
+        (proj["start_idx"] // 12, max(proj["end_idx"], proj["start_idx"]) // 12, proj["project_id"], proj)
+        for proj in projects
+    )
+    groups = []
+    current_end = None
+    for start_year, end_year, _, proj in spans:
+        if current_end is None or start_year > current_end:
+            groups.append([])
+            current_end = end_year
+        else:
+            current_end = max(current_end, end_year)
+        groups[-1].append(proj)
+    return [sorted(group, key=lambda p: p["project_id"]) for group in groups]
+
+
+def component_key(group):
+    # The order of the group stands in for the project ids: the solvers only compare them
+    signature = [
+        (str(p["period_str"]), p["original_am"], p["start_idx"], p["end_idx"], p["is_yellow"])
+        for p in group
+    ]
+    return hashlib.sha256(json.dumps(signature).encode("utf-8")).hexdigest()
+
+
+def _settings(max_yearly_capacity, solver, order):
+    return {"max_yearly_capacity": max_yearly_capacity, "solver": solver, "order": order}
+
+
+def _add_counters(total, counters):
+    for name, value in counters.items():
+        if isinstance(value, dict):
+            merged = total.setdefault(name, {})
+            for key, count in value.items():
+                merged[key] = merged.get(key, 0) + count
+        else:
+            total[name] = total.get(name, 0) + value
+
+
+def _saved_reason(reason, positions):
+    # The owner of a taken month is saved as its position in the group
+    if reason[0] == MONTH_TAKEN:
+        return [MONTH_TAKEN, reason[1], positions[reason[2]]]
+    return list(reason)
+
+
+def _restored_reason(reason, group):
+    if reason[0] == MONTH_TAKEN:
+        return (MONTH_TAKEN, reason[1], group[reason[2]]["project_id"])
+    return tuple(reason)
+
+
+def _saved_component(group, allocation):
+    months = {}
+    for month_idx, project_id in allocation["assignment"].items():
+        months.setdefault(project_id, []).append(month_idx)
+    positions = {p["project_id"]: i for i, p in enumerate(group)}
+    return {
+        "projects": [
+            {
+                "allocated_am": p["allocated_am"],
+                "unallocated_am": p["unallocated_am"],
+                "reasons_log": [_saved_reason(reason, positions) for reason in p["reasons_log"]],
+                "months": sorted(months.get(p["project_id"], [])),
+            }
+            for p in group
+        ],
+        "yearly_am_totals": sorted(allocation["yearly_am_totals"].items()),
+        "warnings": allocation["warnings"],
+    }
+
+
+def allocate_incremental(projects, state=None, max_yearly_capacity=MAX_YEARLY_CAPACITY, solver="greedy",
+                         progress=None, order=DEFAULT_ORDER):
+    """Same result as engine.allocate, reusing the unchanged groups of ``state``.
+
+    The result also holds the new ``state`` (only the current groups). The
+    ``counters`` cover the recomputed groups, plus ``groups_reused`` and
+    ``groups_recomputed``. A state saved with other settings is ignored.
+    """
+    settings = _settings(max_yearly_capacity, solver, order)
+    saved = {}
+    if state and state.get("version") == STATE_VERSION and state.get("settings") == settings:
+        saved = state["components"]
+
+    new_components = {}
+    assignment = {}
+    yearly_am_totals = {year: 0 for year in allocation_years(projects)}
+    warnings = []
+    counters = {"groups_reused": 0, "groups_recomputed": 0}
+    groups = [(component_key(group), group) for group in components(projects)]
+    changed = []
+
+    for key, group in groups:
+        if key in saved:
+            counters["groups_reused"] += 1
+            new_components[key] = saved[key]
+        else:
+            changed.append((key, group))
+
+    # All changed groups go through one allocate() call so progress sees each phase once
+    if changed:
+        changed_projects = [p for _, group in changed for p in group]
+        allocation = allocate(changed_projects, max_yearly_capacity, solver=solver, progress=progress, order=order)
+        for key, group in changed:
+            group_ids = {p["project_id"] for p in group}
+            group_years = set(allocation_years(group))
+            group_allocation = {
+                "assignment": {m: pid for m, pid in allocation["assignment"].items() if pid in group_ids},
+                "yearly_am_totals": {y: t for y, t in allocation["yearly_am_totals"].items() if y in group_years},
+                "warnings": [w for w in allocation["warnings"] if w.get("year") in group_years],
+            }
+            new_components[key] = _saved_component(group, group_allocation)
+        counters["groups_recomputed"] = len(changed)
+        _add_counters(counters, allocation["counters"])
+
+    recomputed = {key for key, _ in changed}
+    for key, group in groups:
+        component = new_components[key]
+        for proj, saved_proj in zip(group, component["projects"]):
+            if key not in recomputed:
+                proj["allocated_am"] = saved_proj["allocated_am"]
+                proj["unallocated_am"] = saved_proj["unallocated_am"]
+                proj["reasons_log"] = {_restored_reason(reason, group): None for reason in saved_proj["reasons_log"]}
+            for month_idx in saved_proj["months"]:
+                assignment[month_idx] = proj["project_id"]
+        for year, total in component["yearly_am_totals"]:
+            yearly_am_totals[year] = total
+        warnings.extend(component["warnings"])
+
+    return {
+        "projects": allocation_order(projects, order),
+        "years": sorted(yearly_am_totals),
+        "assignment": dict(sorted(assignment.items())),
+        "yearly_am_totals": yearly_am_totals,
+        "max_yearly_capacity": max_yearly_capacity,
+        "warnings": sorted(warnings, key=lambda w: w.get("year", 0)),
+        "counters": counters,
+        "state": {"version": STATE_VERSION, "settings": settings, "components": new_components},
+    }
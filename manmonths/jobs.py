@@ -0,0 +1,180 @@
+# ------------------------------------------------
+# Ουρά εργασιών (process pool) για τη σελίδα Streamlit
+# ------------------------------------------------
+# Κάθε κατανομή υποβάλλεται σε ένα κοινό, περιορισμένο process pool αντί να
+# τρέχει μέσα στο thread της σελίδας. Η φάση που εκτελείται (progress.PHASES)
+# γράφεται σε ένα κοινό dict ενός multiprocessing.Manager, ώστε η σελίδα να
+# κάνει polling. Η ακύρωση είναι συνεργατική: μια εργασία σε αναμονή αφαιρείται
+# από την ουρά, μια εργασία που τρέχει σταματά στην αρχή της επόμενης φάσης.
+#
+# Οι εργασίες αναγνωρίζονται από ένα κλειδί (π.χ. hash INPUT + ρυθμίσεις). Ίδιο
+# κλειδί επιστρέφει την ίδια εργασία, οπότε οι τελευταίες ολοκληρωμένες
+# εργασίες λειτουργούν και ως cache αποτελεσμάτων. Το xlsx (ή zip) κάθε
+# εργασίας γράφεται σε αρχείο σε έναν προσωρινό φάκελο της ουράς (όχι σε bytes
+# στη μνήμη) και σβήνεται όταν η εργασία φύγει από την ουρά.
+#
+# Μια εργασία είναι είτε ένα INPUT (pipeline.process_excel_data) είτε ένα
+# INPUT με ένα φύλλο ανά άτομο (multisheet.process_person_sheets), που μέσα
+# στο δικό της process μοιράζει τα άτομα σε ένα δεύτερο pool.
+
+import io
+import multiprocessing
+import os
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+from .progress import PHASES, Cancelled
+from .template import ZIP
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+CANCELLED = "cancelled"
+FAILED = "error"
+
+# What a job runs
+SINGLE_SHEET = "single_sheet"
+PERSON_SHEETS = "person_sheets"
+JOB_KINDS = (SINGLE_SHEET, PERSON_SHEETS)
+
+FINISHED_JOBS_KEPT = 32
+
+
+def _output_path(output_dir, token, kind, options):
+    suffix = ".zip" if kind == PERSON_SHEETS and options.get("layout") == ZIP else ".xlsx"
+    return os.path.join(output_dir, f"{token}{suffix}")
+
+
+def _run_job(token, phases, cancel_requests, kind, template_path, input_bytes, output_path, options):
+    """Worker entry point: run the pipeline for one job, reporting its phases."""
+    if kind == PERSON_SHEETS:
+        from .multisheet import process_person_sheets as run
+    else:
+        from .pipeline import process_excel_data as run
+
+    def progress(phase):
+        if token in cancel_requests:
+            raise Cancelled()
+        phases[token] = phase
+
+    result = run(template_path, io.BytesIO(input_bytes), progress=progress, **options)
+    if result["output"] is not None:
+        with result["output"] as output, open(output_path, "wb") as f:
+            shutil.copyfileobj(output, f)
+        result["output"] = output_path
+    return result
+
+
+class JobQueue:
+    """Bounded process pool running ``process_excel_data`` or ``process_person_sheets`` jobs by key."""
+
+    def __init__(self, max_workers=None, finished_jobs_kept=FINISHED_JOBS_KEPT):
+        self._pool = ProcessPoolExecutor(max_workers=max_workers)
+        self._manager = multiprocessing.Manager()
+        self._phases = self._manager.dict()
+        self._cancel_requests = self._manager.dict()
+        self._jobs = OrderedDict() # key -> {"token", "future", "output_path"}
+        self._output_dir = tempfile.mkdtemp(prefix="manmonths-jobs-")
+        self._finished_jobs_kept = finished_jobs_kept
+        self._next_token = 0
+        self._lock = threading.Lock()
+
+    def submit(self, key, template_path, input_bytes, kind=SINGLE_SHEET, **options):
+        """Queue a job unless one with ``key`` is pending, running or done.
+
+        ``kind`` is one of JOB_KINDS; ``options`` go to the function it runs.
+        """
+        if kind not in JOB_KINDS:
+            raise ValueError(f"Unknown job kind: '{kind}'. Expected one of: {', '.join(JOB_KINDS)}.")
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is not None and self._state(job) not in (CANCELLED, FAILED):
+                self._jobs.move_to_end(key)
+                return key
+            if job is not None:
+                self._forget(key)
+
+            token = self._next_token
+            self._next_token += 1
+            output_path = _output_path(self._output_dir, token, kind, options)
+            future = self._pool.submit(
+                _run_job, token, self._phases, self._cancel_requests, kind, template_path, input_bytes, output_path,
+                options,
+            )
+            self._jobs[key] = {"token": token, "future": future, "output_path": output_path}
+            self._evict_finished()
+            return key
+
+    def status(self, key):
+        """Return the job's state, current phase and progress, or None if unknown.
+
+        ``result`` holds the pipeline result once the job is done, with ``output``
+        as the path of the xlsx or zip (valid until the job is evicted); ``error`` holds
+        the message of a failed job.
+        """
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is None:
+                return None
+            state = self._state(job)
+            phase = self._phases.get(job["token"])
+            status = {
+                "state": state,
+                "phase": phase,
+                "progress": 1.0 if state == DONE else (PHASES.index(phase) / len(PHASES) if phase else 0.0),
+                "result": None,
+                "error": None,
+            }
+            if state == DONE:
+                status["result"] = job["future"].result()
+            elif state == FAILED:
+                error = job["future"].exception()
+                status["error"] = f"{type(error).__name__}: {error}"
+            return status
+
+    def cancel(self, key):
+        """Cancel a queued job, or stop a running one at its next phase."""
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is None or job["future"].done():
+                return False
+            if not job["future"].cancel():
+                self._cancel_requests[job["token"]] = True
+            return True
+
+    def shutdown(self):
+        with self._lock:
+            for job in self._jobs.values():
+                job["future"].cancel()
+            self._jobs.clear()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        self._manager.shutdown()
+        shutil.rmtree(self._output_dir, ignore_errors=True)
+
+    def _state(self, job):
+        future = job["future"]
+        if future.cancelled():
+            return CANCELLED
+        if not future.done():
+            return RUNNING if job["token"] in self._phases else QUEUED
+        if isinstance(future.exception(), Cancelled):
+            return CANCELLED
+        return FAILED if future.exception() is not None else DONE
+
+    def _forget(self, key):
+        job = self._jobs.pop(key)
+        self._phases.pop(job["token"], None)
+        self._cancel_requests.pop(job["token"], None)
+        try:
+            os.remove(job["output_path"])
+        except FileNotFoundError:
+            pass
+
+    def _evict_finished(self):
+        # Oldest finished jobs go first; pending and running jobs are never dropped
+        finished = [k for k, job in self._jobs.items() if job["future"].done()]
+        for key in finished[:max(0, len(finished) - self._finished_jobs_kept)]:
+            self._forget(key)
@@ -0,0 +1,213 @@
+# ------------------------------------------------
+# Ένα INPUT με πολλά άτομα (ένα φύλλο ανά άτομο)
+# ------------------------------------------------
+# python -m manmonths.multisheet INPUT.xlsx [-o out.xlsx] [--layout merged|zip] [--workers 8]
+#
+# Το INPUT ανοίγει μία φορά και διαβάζεται κάθε φύλλο με στήλες ΧΡΟΝΙΚΟ
+# ΔΙΑΣΤΗΜΑ και ΑΝΘΡΩΠΟΜΗΝΕΣ (βλ. reader.read_person_sheets). Κάθε άτομο
+# κατανέμεται ανεξάρτητα σε παράλληλα processes. Με --layout merged τα ζεύγη
+# φύλλων 'ΑΝΑΛΥΣΗ <άτομο>' / 'CV <άτομο>' γράφονται σε ένα κοινό workbook (στο
+# κύριο process, γιατί ένα workbook γράφεται σειριακά). Με --layout zip κάθε
+# process γράφει και το δικό του xlsx και όλα μπαίνουν σε ένα zip.
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from .cli import DATA_SUFFIX, OUTPUT_SUFFIX, output_file_name
+from .diagnostics import ERROR, MISSING_COLUMNS, diagnostic
+from .engine import DEFAULT_ORDER, MAX_YEARLY_CAPACITY, ORDERS, SOLVERS, allocate
+from .pipeline import allocation_result, build_projects, failed_result, new_counters, run_report, write_person_sheets
+from .progress import PARSE, SAVE, TEMPLATE, PhaseTimer
+from .reader import AM_HEADER, PERIOD_HEADER, read_person_sheets
+from .render import CV_SHEET_TITLE, MATCH_COLUMN, SPOOL_MAX_BYTES, new_workbook, save_workbook
+from .template import LAYOUTS, MERGED, ROW_INDEX_FORMULA, ROW_INDEX_MODES, TEMPLATE_FILE_NAME, ZIP, template_workbook
+
+# Excel limit on sheet titles
+MAX_SHEET_TITLE = 31
+
+
+def sheet_titles(names, analysis_title):
+    """Unique ('ΑΝΑΛΥΣΗ <name>', 'CV <name>') titles per person, within Excel's length limit."""
+    titles = []
+    used = set()
+    for name in names:
+        base = name[:MAX_SHEET_TITLE - len(analysis_title) - 1]
+        label, n = base, 1
+        # Excel compares sheet titles case-insensitively
+        while label.casefold() in used:
+            n += 1
+            label = f"{base[:MAX_SHEET_TITLE - len(analysis_title) - len(str(n)) - 2]}~{n}"
+        used.add(label.casefold())
+        titles.append((f"{analysis_title} {label}", f"{CV_SHEET_TITLE} {label}"))
+    return titles
+
+
+def allocate_person(source, template_path, max_yearly_capacity, solver, order, row_index, cv_styles, render):
+    """Worker entry point: allocate one person sheet, and render it on its own if ``render``.
+
+    Returns a result dict as process_excel_data does, with the ``name`` of the
+    sheet and, when not rendering, the ``allocation`` for the merged workbook.
+    """
+    diagnostics = []
+    timer = PhaseTimer()
+    counters = new_counters()
+
+    data = build_projects(source["rows"], diagnostics, counters)
+    allocation = allocate(data, max_yearly_capacity, solver=solver, progress=timer, order=order)
+    diagnostics.extend(allocation["warnings"])
+    counters.update(allocation["counters"])
+
+    output = None
+    if render:
+        timer(TEMPLATE)
+        template_wb = template_workbook(template_path)
+        wb = new_workbook(template_wb)
+        write_person_sheets(wb, template_wb.active, allocation, source, source["cv_rows"], cv_styles, timer,
+                            row_index=row_index)
+        timer(SAVE)
+        with save_workbook(wb) as spooled:
+            output = spooled.read()
+
+    result = allocation_result(output, allocation, diagnostics, timer, counters)
+    result["name"] = source["title"]
+    if not render:
+        result["allocation"] = allocation
+    return result
+
+
+def process_person_sheets(template_path, uploaded_input_file, layout=MERGED, solver="greedy", cv_values_only=False,
+                          max_yearly_capacity=MAX_YEARLY_CAPACITY, progress=None, order=DEFAULT_ORDER,
+                          row_index=ROW_INDEX_FORMULA, workers=None):
+    """Allocate every person sheet of one INPUT workbook in a process pool.
+
+    Returns a dict with the ``output`` (a rewound SpooledTemporaryFile holding
+    the merged xlsx, or the zip of one xlsx per person), the result of each
+    person in workbook order under ``people`` (see process_excel_data, plus
+    the sheet ``name``), the ``diagnostics`` and the ``report`` of the whole
+    run. ``workers=1`` runs the people in this process. If no sheet has the
+    period and AM columns, ``output`` is None and ``diagnostics`` holds the error.
+    """
+    if layout not in LAYOUTS:
+        raise ValueError(f"Unknown layout: '{layout}'. Expected one of: {', '.join(LAYOUTS)}.")
+    if row_index not in ROW_INDEX_MODES:
+        raise ValueError(f"Unknown row index mode: '{row_index}'. Expected one of: {', '.join(ROW_INDEX_MODES)}.")
+    diagnostics = []
+    timer = PhaseTimer(progress)
+    counters = {"sheets": 0}
+
+    timer(PARSE)
+    cv_styles = {}
+    if cv_values_only:
+        sources = read_person_sheets(uploaded_input_file, cv_styles, cv_styles=False, cv_columns=(MATCH_COLUMN,))
+    else:
+        sources = read_person_sheets(uploaded_input_file, cv_styles)
+    counters["sheets"] = len(sources)
+    if not sources:
+        diagnostics.append(diagnostic(
+            ERROR, MISSING_COLUMNS, f"Κανένα φύλλο του input δεν έχει στήλες: {PERIOD_HEADER} και {AM_HEADER}",
+        ))
+        result = failed_result(diagnostics, timer, counters)
+        result["people"] = []
+        return result
+
+    worker = partial(
+        allocate_person, template_path=template_path, max_yearly_capacity=max_yearly_capacity, solver=solver,
+        order=order, row_index=row_index, cv_styles=cv_styles, render=layout == ZIP,
+    )
+    # The merged workbook is rendered here, so its workers do not need the 'CV' rows
+    jobs = sources if layout == ZIP else [dict(source, cv_rows=()) for source in sources]
+    if workers == 1:
+        people = [worker(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            people = list(pool.map(worker, jobs))
+
+    if layout == MERGED:
+        timer(TEMPLATE)
+        template_wb = template_workbook(template_path)
+        wb = new_workbook(template_wb)
+        titles = sheet_titles([person["name"] for person in people], template_wb.active.title)
+        for source, person, (title, cv_title) in zip(sources, people, titles):
+            write_person_sheets(wb, template_wb.active, person.pop("allocation"), source, source["cv_rows"],
+                                cv_styles, timer, row_index=row_index, title=title, cv_title=cv_title)
+        timer(SAVE)
+        output = save_workbook(wb)
+    else:
+        timer(SAVE)
+        output = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES)
+        # The xlsx files are already compressed
+        with zipfile.ZipFile(output, "w", zipfile.ZIP_STORED) as archive:
+            for person in people:
+                archive.writestr(f"{person['name']}{OUTPUT_SUFFIX}", person.pop("output"))
+        output.seek(0)
+
+    for person in people:
+        person["output"] = None
+        diagnostics.extend(dict(diag, sheet=person["name"]) for diag in person["diagnostics"])
+
+    return {
+        "output": output,
+        "people": people,
+        "diagnostics": diagnostics,
+        "report": run_report(timer, counters),
+    }
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m manmonths.multisheet",
+                                     description="Κατανομή ΑΜ για κάθε άτομο (φύλλο) ενός INPUT excel.")
+    parser.add_argument("input", help="INPUT .xlsx με ένα φύλλο ανά άτομο")
+    parser.add_argument("-o", "--output", default=None,
+                        help="Αρχείο εξόδου (default: '<INPUT>_ΚΑΤΑΝΟΜΗ ΑΜ.xlsx' ή '.zip')")
+    parser.add_argument("--layout", choices=LAYOUTS, default=MERGED,
+                        help="merged: ένα Excel με ζεύγη φύλλων ανά άτομο, zip: ένα Excel ανά άτομο σε zip")
+    parser.add_argument("--json", default=None, help="Αρχείο JSON με τα αποτελέσματα ανά άτομο")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Πλήθος processes")
+    parser.add_argument("--template", default=TEMPLATE_FILE_NAME, help=f"Template (default: '{TEMPLATE_FILE_NAME}')")
+    parser.add_argument("--solver", choices=list(SOLVERS), default="greedy", help="Αλγόριθμος κατανομής")
+    parser.add_argument("--capacity", type=int, default=MAX_YEARLY_CAPACITY, help="Μέγιστη ετήσια χωρητικότητα")
+    parser.add_argument("--order", choices=list(ORDERS), default=DEFAULT_ORDER, help="Σειρά κατανομής")
+    parser.add_argument("--cv-values-only", action="store_true", help="Φύλλα CV μόνο με τιμές (ταχύτερο)")
+    parser.add_argument("--row-index", choices=ROW_INDEX_MODES, default=ROW_INDEX_FORMULA,
+                        help="Στήλη Α/Α της ΑΝΑΛΥΣΗ: τύποι MATCH (default) ή σταθερές τιμές (χωρίς επανυπολογισμό)")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    with open(args.input, "rb") as f:
+        run = process_person_sheets(
+            os.path.abspath(args.template), f, layout=args.layout, solver=args.solver,
+            cv_values_only=args.cv_values_only, max_yearly_capacity=args.capacity, order=args.order,
+            row_index=args.row_index, workers=args.workers,
+        )
+    for diag in run["diagnostics"]:
+        print(f"{diag.get('sheet', '')}: {diag['message']}", file=sys.stderr)
+    if run["output"] is None:
+        return 2
+
+    output_path = args.output or output_file_name(args.input, f"{DATA_SUFFIX}.zip" if args.layout == ZIP else OUTPUT_SUFFIX)
+    with run["output"] as output, open(output_path, "wb") as f:
+        shutil.copyfileobj(output, f)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"people": run["people"], "report": run["report"]}, f, ensure_ascii=False, indent=2, default=str)
+
+    for person in run["people"]:
+        allocated = sum(person["yearly_am_totals"].values())
+        unallocated = sum(proj["unallocated_am"] for proj in person["unallocated_projects"])
+        print(f"{person['name']}: κατανεμημένοι ΑΜ: {allocated}, μη κατανεμημένοι ΑΜ: {unallocated}", file=sys.stderr)
+    print(f"{len(run['people'])} άτομα -> {output_path}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
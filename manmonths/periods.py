@@ -0,0 +1,182 @@
+# ------------------------------------------------
+# Δείκτης μηνών
+# ------------------------------------------------
+# Ένας μήνας αναπαρίσταται ως ακέραιος year * 12 + month - 1, οπότε μια
+# περίοδος είναι απλώς το κλειστό διάστημα [start_idx, end_idx].
+
+import calendar
+import re
+import unicodedata
+from datetime import date
+from functools import lru_cache
+
+
+def month_index(year, month):
+    return year * 12 + month - 1
+
+
+def month_from_index(idx):
+    year, month0 = divmod(idx, 12)
+    return year, month0 + 1
+
+
+def months_in_range(start_idx, end_idx):
+    return max(0, end_idx - start_idx + 1)
+
+
+def allocation_years(projects):
+    years = set()
+    for proj in projects:
+        if proj["months_in_period_count"] > 0:
+            years.update(range(proj["start_idx"] // 12, proj["end_idx"] // 12 + 1))
+    return sorted(years)
+
+
+# ------------------------------------------------
+# Ανάλυση περιόδων
+# ------------------------------------------------
+# Οι περίοδοι μετατρέπονται κατευθείαν σε δείκτες μηνών, χωρίς strptime.
+# Το αποτέλεσμα κρατιέται σε LRU cache με κλειδί το κανονικοποιημένο κείμενο
+# της περιόδου. Το "Σήμερα" αποθηκεύεται ως TODAY και αντικαθίσταται από τον
+# μήνα της τρέχουσας εκτέλεσης (today_idx), οπότε το cache δεν παλιώνει.
+
+TODAY = "today"
+PERIOD_CACHE_SIZE = 4096
+
+DATE_FORMATS_HELP = (
+    "Expected 'YYYY', 'M/YYYY' or 'MM/YYYY', 'D/M/YYYY' or 'DD/MM/YYYY', 'YYYY-MM', "
+    "'<Greek month> YYYY', or 'Σήμερα' (for end date)."
+)
+
+_DASHES = str.maketrans({"—": "-", "–": "-"})
+_WHITESPACE_RE = re.compile(r"\s+")
+_YEAR_RE = re.compile(r"^\d{4}$")
+_MONTH_YEAR_RE = re.compile(r"^(\d{1,2})/(\d{4})$")
+_DAY_MONTH_YEAR_RE = re.compile(r"^(\d{1,2})/(\d{1,2})/(\d{4})$")
+_ISO_MONTH_RE = re.compile(r"^(\d{4})-(\d{1,2})$")
+_NAMED_MONTH_RE = re.compile(r"^([^\W\d_]+)\.?\s+(\d{4})$")
+
+# Accent-free prefixes of Greek month names (nominative and genitive forms)
+_GREEK_MONTH_PREFIXES = (
+    ("ιαν", 1), ("φεβ", 2), ("μαρ", 3), ("απρ", 4), ("μαι", 5), ("ιουν", 6),
+    ("ιουλ", 7), ("αυγ", 8), ("σεπ", 9), ("οκτ", 10), ("νοε", 11), ("δεκ", 12),
+)
+
+
+def _strip_accents(text):
+    return "".join(ch for ch in unicodedata.normalize("NFD", text) if not unicodedata.combining(ch))
+
+
+def normalize_period(p):
+    return _WHITESPACE_RE.sub(" ", str(p).strip().translate(_DASHES))
+
+
+def today_index():
+    today = date.today()
+    return month_index(today.year, today.month)
+
+
+def _valid_month_index(year, month, day=1):
+    if year < 1 or not 1 <= month <= 12 or not 1 <= day <= calendar.monthrange(year, month)[1]:
+        raise ValueError(f"Invalid date: '{day}/{month}/{year}'.")
+    return month_index(year, month)
+
+
+def _greek_month(name):
+    name = _strip_accents(name.lower())
+    if len(name) >= 3:
+        for prefix, month in _GREEK_MONTH_PREFIXES:
+            if name.startswith(prefix):
+                return month
+    return None
+
+
+def parse_date_index(text, is_start=True):
+    """Month index of a single date; TODAY for 'Σήμερα' as an end date."""
+    text = text.strip()
+    folded = _strip_accents(text.lower())
+    if not is_start and ("σημερα" in folded or "simera" in folded):
+        return TODAY
+
+    if _YEAR_RE.match(text):
+        return _valid_month_index(int(text), 1 if is_start else 12)
+
+    match = _MONTH_YEAR_RE.match(text)
+    if match:
+        return _valid_month_index(int(match.group(2)), int(match.group(1)))
+
+    match = _DAY_MONTH_YEAR_RE.match(text)
+    if match:
+        return _valid_month_index(int(match.group(3)), int(match.group(2)), int(match.group(1)))
+
+    match = _ISO_MONTH_RE.match(text)
+    if match:
+        return _valid_month_index(int(match.group(1)), int(match.group(2)))
+
+    match = _NAMED_MONTH_RE.match(text)
+    if match and _greek_month(match.group(1)):
+        return _valid_month_index(int(match.group(2)), _greek_month(match.group(1)))
+
+    raise ValueError(f"Unsupported date format: '{text}'. {DATE_FORMATS_HELP}")
+
+
+def _parse_single(text):
+    # A lone 'YYYY', 'YYYY-MM' or '<month> YYYY' covers that year or month
+    start_idx = parse_date_index(text, True)
+    end_idx = parse_date_index(text, False)
+    return start_idx, end_idx
+
+
+@lru_cache(maxsize=PERIOD_CACHE_SIZE)
+def _parse_normalized_period(p_cleaned):
+    # Returns (start_idx, end_idx_or_TODAY, None) or (None, None, error message)
+    if _YEAR_RE.match(p_cleaned):
+        return _parse_single(p_cleaned) + (None,)
+
+    parts = p_cleaned.split("-")
+    if len(parts) == 2:
+        try:
+            return parse_date_index(parts[0], True), parse_date_index(parts[1], False), None
+        except ValueError as e:
+            first_error = str(e)
+    else:
+        first_error = None
+
+    # Dates that contain a dash themselves ('2019-03 - 2020-05', '2019-03'):
+    # try every split point, then the whole text as a single date. The last
+    # split comes first: 'Σήμερα' matches anywhere in the end date, so in
+    # '2019-03 - Σήμερα' the end must not swallow '03 - Σήμερα'.
+    for split_at in range(len(parts) - 1, 0, -1):
+        if split_at == 1 and len(parts) == 2:
+            continue
+        try:
+            return (
+                parse_date_index("-".join(parts[:split_at]), True),
+                parse_date_index("-".join(parts[split_at:]), False),
+                None,
+            )
+        except ValueError:
+            pass
+    try:
+        return _parse_single(p_cleaned) + (None,)
+    except ValueError:
+        pass
+
+    if first_error:
+        return None, None, first_error
+    return None, None, f"Invalid period format: '{p_cleaned}'. Expected 'YYYY' or 'START_DATE-END_DATE'."
+
+
+def parse_period_range(p, today_idx=None):
+    """Parse a period cell into ``(start_idx, end_idx)`` month indices.
+
+    ``today_idx`` is the month used for 'Σήμερα'; pass the value of
+    ``today_index()`` taken once per run. Raises ValueError for
+    unsupported periods.
+    """
+    start_idx, end_idx, error = _parse_normalized_period(normalize_period(p))
+    if error:
+        raise ValueError(error)
+    if end_idx == TODAY:
+        end_idx = today_idx if today_idx is not None else today_index()
+    return start_idx, end_idx
@@ -0,0 +1,209 @@
+# ------------------------------------------------
+# Επεξεργασία ενός INPUT (χωρίς Streamlit)
+# ------------------------------------------------
+# Κοινή ροή για τη σελίδα Streamlit και το batch CLI: ανάγνωση INPUT,
+# κατανομή, απόδοση των φύλλων 'ΑΝΑΛΥΣΗ'/'CV' και αποθήκευση.
+
+from .diagnostics import ERROR, MISSING_COLUMNS, PERIOD_PARSE_ERROR, WARNING, diagnostic
+from .engine import DEFAULT_ORDER, MAX_YEARLY_CAPACITY, allocate, unallocated_report
+from .incremental import allocate_incremental
+from .periods import months_in_range, parse_period_range, today_index
+from .progress import CV_COPY, PARSE, RENDER, SAVE, TEMPLATE, PhaseTimer
+from .reader import read_input
+from .render import CV_SHEET_TITLE, MATCH_COLUMN, new_workbook, save_workbook, write_analysis_sheet, write_cv_sheet
+from .template import ROW_INDEX_FORMULA, ROW_INDEX_MODES, template_workbook
+
+
+def new_counters():
+    return {"rows_read": 0, "rows_parsed": 0, "rows_skipped": 0}
+
+
+def run_report(timer, counters):
+    timer.stop()
+    return {"total_seconds": timer.total_seconds, "phases": timer.phases, "counters": counters}
+
+
+def failed_result(diagnostics, timer, counters):
+    # The INPUT could not be used; diagnostics hold the error
+    return {
+        "output": None,
+        "unallocated_projects": None,
+        "yearly_am_totals": None,
+        "yearly_overages": None,
+        "max_yearly_capacity": None,
+        "diagnostics": diagnostics,
+        "report": run_report(timer, counters),
+    }
+
+
+def build_projects(rows, diagnostics, counters):
+    """Turn the INPUT rows of read_input into the project dicts of the engine.
+
+    Rows without a period or AM are ignored; rows whose period cannot be parsed
+    are skipped with a warning diagnostic.
+    """
+    data = []
+    project_counter = 0 # Initialize project counter
+
+    today_idx = today_index() # 'Σήμερα' resolves once per run
+
+    counters["rows_read"] = len(rows)
+    for source_row in rows:
+        r = source_row["row"]
+        period = source_row["period"]
+        am_raw = source_row["am_raw"]
+        try:
+            am = int(am_raw) if am_raw is not None else 0
+        except (ValueError, TypeError):
+            am = 0
+
+        if not period or am == 0:
+            continue
+
+        try:
+            start_idx, end_idx = parse_period_range(period, today_idx)
+        except ValueError as e:
+            diagnostics.append(diagnostic(
+                WARNING, PERIOD_PARSE_ERROR, f"Skipping row {r} due to period parsing error: {e}",
+                row=r, period=period,
+            ))
+            counters["rows_skipped"] += 1
+            continue
+
+        months_in_period_count = months_in_range(start_idx, end_idx)
+
+        if months_in_period_count > 0:
+            am_per_month_ratio = am / months_in_period_count
+        else:
+            am_per_month_ratio = 0
+
+        data.append({
+            "project_id": project_counter,
+            "period_str": period,
+            "original_am": am,
+            "start_idx": start_idx,
+            "end_idx": end_idx,
+            "months_in_period_count": months_in_period_count,
+            "am_per_month_ratio": am_per_month_ratio,
+            "allocated_am": 0,
+            "unallocated_am": am,
+            "is_yellow": source_row["is_yellow"],
+            "input_row": r,
+            "excel_row": 0,
+            "reasons_log": {}
+        })
+        project_counter += 1
+        counters["rows_parsed"] += 1
+
+    return data
+
+
+def summary_total(projects):
+    """C2 of 'ΑΝΑΛΥΣΗ': the AM allocated to yellow projects, or all the AM if there are none."""
+    total_yellow_allocated_am_final = 0
+    for project_data in projects:
+        if project_data["is_yellow"]:
+            total_yellow_allocated_am_final += project_data["allocated_am"]
+    if total_yellow_allocated_am_final > 0:
+        return total_yellow_allocated_am_final
+    return sum(project_data["original_am"] for project_data in projects)
+
+
+def allocation_result(output, allocation, diagnostics, timer, counters):
+    """The result dict of process_excel_data for an ``allocation``."""
+    max_yearly_capacity = allocation["max_yearly_capacity"]
+    yearly_am_totals = allocation["yearly_am_totals"]
+    return {
+        "output": output,
+        "unallocated_projects": unallocated_report(allocation["projects"]),
+        "yearly_am_totals": yearly_am_totals,
+        "yearly_overages": {
+            y: total - max_yearly_capacity for y, total in yearly_am_totals.items() if total > max_yearly_capacity
+        },
+        "max_yearly_capacity": max_yearly_capacity,
+        "diagnostics": diagnostics,
+        "report": run_report(timer, counters),
+        "state": allocation.get("state"),
+    }
+
+
+def write_person_sheets(wb, template_ws, allocation, source, cv_rows, cv_styles, timer, row_index=ROW_INDEX_FORMULA,
+                        title=None, cv_title=CV_SHEET_TITLE):
+    """Render one allocation as a 'CV' / 'ΑΝΑΛΥΣΗ' pair of sheets of ``wb``."""
+    timer(CV_COPY)
+    last_row_b = source["last_rows"].get(MATCH_COLUMN, 0)
+    write_cv_sheet(wb, cv_rows, cv_styles, source["column_widths"], last_row_b, title=cv_title)
+
+    timer(RENDER)
+    write_analysis_sheet(
+        wb, template_ws, allocation, allocation["max_yearly_capacity"], summary_total(allocation["projects"]),
+        last_row_b, row_index=row_index, title=title, cv_title=cv_title,
+    )
+
+
+def process_excel_data(template_path, uploaded_input_file, solver="greedy", cv_values_only=False,
+                       max_yearly_capacity=MAX_YEARLY_CAPACITY, progress=None, order=DEFAULT_ORDER,
+                       state=None, row_index=ROW_INDEX_FORMULA):
+    """Allocate one INPUT workbook and render it on the template.
+
+    Returns a dict with the ``output`` xlsx (a rewound SpooledTemporaryFile),
+    ``unallocated_projects``,
+    ``yearly_am_totals``, ``yearly_overages``, ``max_yearly_capacity`` and the
+    run ``diagnostics`` (skipped rows, capacity problems) and ``report`` (seconds
+    per phase and counters). If the INPUT cannot be used, ``output`` is None and
+    ``diagnostics`` holds the error.
+    ``progress`` is called with the name of each phase as it starts (see
+    progress.PHASES) and may raise progress.Cancelled to stop the run.
+    With a ``state`` (``{}`` on the first run) the allocation is incremental
+    (see incremental) and the result holds the new ``state`` to save.
+    ``row_index`` chooses MATCH formulas or static numbers for column A of
+    'ΑΝΑΛΥΣΗ' (see template.ROW_INDEX_MODES).
+    """
+    if row_index not in ROW_INDEX_MODES:
+        raise ValueError(f"Unknown row index mode: '{row_index}'. Expected one of: {', '.join(ROW_INDEX_MODES)}.")
+    diagnostics = []
+    timer = PhaseTimer(progress)
+    counters = new_counters()
+
+    # ------------------------------------------------
+    # Read INPUT and find columns
+    # ------------------------------------------------
+    timer(PARSE)
+    cv_styles = {}
+    try:
+        if cv_values_only:
+            source = read_input(uploaded_input_file, cv_columns=(MATCH_COLUMN,), styles_by_key=cv_styles, cv_styles=False)
+        else:
+            source = read_input(uploaded_input_file, styles_by_key=cv_styles)
+    except ValueError as e:
+        diagnostics.append(diagnostic(ERROR, MISSING_COLUMNS, str(e)))
+        return failed_result(diagnostics, timer, counters)
+
+    data = build_projects(source["rows"], diagnostics, counters)
+
+    # ------------------------------------------------
+    # Allocation (in memory)
+    # ------------------------------------------------
+    if state is None:
+        allocation = allocate(data, max_yearly_capacity, solver=solver, progress=timer, order=order)
+    else:
+        allocation = allocate_incremental(
+            data, state, max_yearly_capacity, solver=solver, progress=timer, order=order,
+        )
+
+    diagnostics.extend(allocation["warnings"])
+    counters.update(allocation["counters"])
+
+    # ------------------------------------------------
+    # Open TEMPLATE
+    # ------------------------------------------------
+    timer(TEMPLATE)
+    template_wb = template_workbook(template_path)
+    wb = new_workbook(template_wb)
+    write_person_sheets(wb, template_wb.active, allocation, source, source.pop("cv_rows"), cv_styles, timer,
+                        row_index=row_index)
+
+    timer(SAVE)
+    output = save_workbook(wb)
+
+    return allocation_result(output, allocation, diagnostics, timer, counters)
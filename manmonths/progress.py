@@ -0,0 +1,63 @@
+# ------------------------------------------------
+# Φάσεις εκτέλεσης (progress)
+# ------------------------------------------------
+# Ο πυρήνας αναφέρει την αρχή κάθε φάσης σε ένα προαιρετικό callback
+# progress(phase). Το callback μπορεί να σταματήσει την εκτέλεση σηκώνοντας
+# Cancelled (βλ. jobs). Ο PhaseTimer τυλίγει ένα τέτοιο callback και κρατά τον
+# χρόνο κάθε φάσης για την αναφορά εκτέλεσης.
+
+import time
+
+PARSE = "parse"
+PASS1 = "pass1"
+PASS2 = "pass2"
+ENFORCE = "enforce"
+TEMPLATE = "template"
+CV_COPY = "cv_copy"
+RENDER = "render"
+SAVE = "save"
+
+# In the order the pipeline runs them
+PHASES = (PARSE, PASS1, PASS2, ENFORCE, TEMPLATE, CV_COPY, RENDER, SAVE)
+
+
+class Cancelled(Exception):
+    """Raised by a progress callback to abort the run at the next phase."""
+
+
+def report(progress, phase):
+    if progress is not None:
+        progress(phase)
+
+
+class PhaseTimer:
+    """Progress callback that records the wall time of each phase.
+
+    Calls are forwarded to ``progress``. A phase lasts until the next one starts
+    or until ``stop()``; ``phases`` maps each phase to its seconds.
+    """
+
+    def __init__(self, progress=None):
+        self.progress = progress
+        self.phases = {}
+        self._started = time.perf_counter()
+        self._current = None
+        self._current_start = self._started
+        self.total_seconds = None
+
+    def __call__(self, phase):
+        self._close(time.perf_counter())
+        self._current = phase
+        report(self.progress, phase)
+
+    def stop(self):
+        now = time.perf_counter()
+        self._close(now)
+        self._current = None
+        self.total_seconds = now - self._started
+        return self.phases
+
+    def _close(self, now):
+        if self._current is not None:
+            self.phases[self._current] = self.phases.get(self._current, 0.0) + (now - self._current_start)
+        self._current_start = now
@@ -0,0 +1,156 @@
+# ------------------------------------------------
+# Ανάγνωση INPUT (read-only, ένα πέρασμα)
+# ------------------------------------------------
+# Το INPUT διαβάζεται μία φορά σε read-only mode. Το πέρασμα κρατά την
+# περίοδο, τους ανθρωπομήνες, αν το κελί της περιόδου είναι κίτρινο, τα πλάτη
+# στηλών και την τελευταία γραμμή με τιμή ανά στήλη. Όταν ζητηθούν, κρατά και
+# τις γραμμές του αντιγράφου 'CV' ως (στήλη, τιμή, κλειδί στυλ) μόνο για τα μη
+# κενά κελιά, με κάθε διαφορετικό στυλ μία φορά, και το workbook κλείνει.
+# Ένα workbook με ένα φύλλο ανά άτομο (read_person_sheets) ανοίγει επίσης μία
+# φορά και κρατά τις γραμμές του 'CV' κάθε ατόμου, για επεξεργασία σε άλλα processes.
+
+from xml.etree.ElementTree import iterparse
+
+import openpyxl
+
+PERIOD_HEADER = "ΧΡΟΝΙΚΟ ΔΙΑΣΤΗΜΑ"
+AM_HEADER = "ΑΝΘΡΩΠΟΜΗΝΕΣ"
+YELLOW_RGB_VALUES = ("FFFF00", "FFFFFF00")
+
+_SHEET_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+
+
+def _column_widths(ws_in):
+    # Read-only worksheets do not expose column_dimensions; <cols> comes before
+    # <sheetData>, so only the head of the sheet XML is parsed.
+    widths = {}
+    with ws_in._get_source() as src:
+        for _, element in iterparse(src, events=("start",)):
+            if element.tag == _SHEET_NS + "sheetData":
+                break
+            if element.tag == _SHEET_NS + "col" and element.get("width") is not None:
+                for col_idx in range(int(element.get("min")), int(element.get("max")) + 1):
+                    widths[col_idx] = float(element.get("width"))
+    return widths
+
+
+def _style_key(cell):
+    # Identical looks share a key even when the source has several xf entries for them
+    if not getattr(cell, "has_style", False):
+        return None
+    style_array = cell.style_array
+    return style_array.fontId, style_array.borderId, style_array.fillId, style_array.numFmtId
+
+
+def is_yellow_cell(cell):
+    if not getattr(cell, "has_style", False):
+        return False
+    cell_rgb = cell.fill.start_color.rgb if cell.fill.start_color else None
+    return cell_rgb in YELLOW_RGB_VALUES
+
+
+def _read_sheet(ws_in, cv_columns=None, styles_by_key=None, cv_styles=True):
+    column_widths = _column_widths(ws_in)
+    if cv_columns is not None:
+        cv_columns = set(cv_columns)
+        column_widths = {c: w for c, w in column_widths.items() if c in cv_columns}
+
+    headers = {}
+    rows = []
+    last_rows = {}
+    cv_rows = [] if styles_by_key is not None else None
+    period_col = am_col = None
+
+    for r, row_cells in enumerate(ws_in.iter_rows(), start=1):
+        if cv_columns is None or cv_columns:
+            cv_row = []
+            for c, cell in enumerate(row_cells, start=1):
+                if cv_columns is not None and c not in cv_columns:
+                    continue
+                if cell.value is not None:
+                    last_rows[c] = r
+                if cv_rows is None:
+                    continue
+                style_key = _style_key(cell) if cv_styles else None
+                if style_key is not None and style_key not in styles_by_key:
+                    styles_by_key[style_key] = (cell.font, cell.border, cell.fill, cell.number_format)
+                if cell.value is not None or style_key is not None:
+                    cv_row.append((c, cell.value, style_key))
+            if cv_rows is not None:
+                cv_rows.append(cv_row)
+
+        if r == 1:
+            for c, cell in enumerate(row_cells, start=1):
+                headers[str(cell.value).strip()] = c
+            if PERIOD_HEADER not in headers or AM_HEADER not in headers:
+                raise ValueError(f"Το input πρέπει να έχει στήλες: {PERIOD_HEADER} και {AM_HEADER}")
+            period_col = headers[PERIOD_HEADER]
+            am_col = headers[AM_HEADER]
+            continue
+
+        period_cell = row_cells[period_col - 1] if period_col <= len(row_cells) else None
+        am_cell = row_cells[am_col - 1] if am_col <= len(row_cells) else None
+        rows.append({
+            "row": r,
+            "period": period_cell.value if period_cell is not None else None,
+            "am_raw": am_cell.value if am_cell is not None else None,
+            "is_yellow": is_yellow_cell(period_cell) if period_cell is not None else False,
+        })
+
+    if period_col is None:
+        raise ValueError(f"Το input πρέπει να έχει στήλες: {PERIOD_HEADER} και {AM_HEADER}")
+
+    source = {
+        "headers": headers,
+        "rows": rows,
+        "column_widths": column_widths,
+        "last_rows": last_rows,
+    }
+    if cv_rows is not None:
+        source["cv_rows"] = cv_rows
+    return source
+
+
+def read_input(uploaded_input_file, cv_columns=None, styles_by_key=None, cv_styles=True):
+    """Stream the INPUT workbook once.
+
+    Returns a dict with the ``headers``, the data ``rows`` (excel row, period,
+    raw AM value, yellow flag), the source ``column_widths`` and ``last_rows``
+    (column -> last row with a value). ``cv_columns`` limits the widths and last
+    rows to the given 1-based columns (``()`` skips them). Raises ValueError if
+    the period or AM column is missing.
+
+    With a ``styles_by_key`` dict the same pass also collects the rows of the
+    'CV' copy under ``cv_rows``: per row, a list of ``(column, value, style_key)``
+    for every non-empty cell of ``cv_columns``. The first cell with a new
+    style_key adds it to ``styles_by_key`` (style_key -> font, border, fill,
+    number_format); ``cv_styles=False`` skips the styles.
+    """
+    wb_in = openpyxl.load_workbook(uploaded_input_file, read_only=True)
+    try:
+        return _read_sheet(wb_in.active, cv_columns, styles_by_key, cv_styles)
+    finally:
+        wb_in.close()
+
+
+def read_person_sheets(uploaded_input_file, styles_by_key, cv_styles=True, cv_columns=None):
+    """Open a workbook with one sheet per person once and read every such sheet.
+
+    A person sheet has the period and AM headers in its first row; the other
+    sheets are skipped. Returns one read_input() dict per person sheet, in
+    workbook order, with its ``title`` and its ``cv_rows`` (filling in
+    ``styles_by_key``).
+    """
+    wb_in = openpyxl.load_workbook(uploaded_input_file, read_only=True)
+    try:
+        sheets = []
+        for ws_in in wb_in.worksheets:
+            try:
+                source = _read_sheet(ws_in, cv_columns, styles_by_key, cv_styles)
+            except ValueError:
+                continue
+            source["title"] = ws_in.title
+            sheets.append(source)
+        return sheets
+    finally:
+        wb_in.close()
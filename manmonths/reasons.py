@@ -0,0 +1,64 @@
+# ------------------------------------------------
+# Λόγοι μη κατανομής (κωδικοί, μηνύματα κατ' απαίτηση)
+# ------------------------------------------------
+# Οι αλγόριθμοι κατανομής δεν φτιάχνουν κείμενα μέσα στους βρόχους. Κάθε λόγος
+# καταγράφεται ως tuple (κωδικός, παράμετροι) στο project_data["reasons_log"],
+# ένα dict που λειτουργεί ως διατεταγμένο σύνολο: ο έλεγχος διπλοτύπων είναι
+# O(1) και κρατιέται η σειρά της πρώτης εμφάνισης. Τα μηνύματα (αγγλικά ή
+# ελληνικά) αποδίδονται μόνο για τα έργα που τελικά έχουν μη κατανεμημένους
+# ΑΜ (βλ. engine.unallocated_report).
+
+from .periods import month_from_index
+
+# (YEAR_FULL, year)
+YEAR_FULL = "year_full"
+# (MONTH_TAKEN, month_idx, project_id of the owner)
+MONTH_TAKEN = "month_taken"
+# (PASS2_YEAR_FULL, year): Pass 2, attempt 1 found the year full
+PASS2_YEAR_FULL = "pass2_year_full"
+# (DEALLOCATED, month_idx): removed by the yearly capacity enforcement
+DEALLOCATED = "deallocated"
+
+LANGUAGES = ("en", "el")
+
+MESSAGES = {
+    "en": {
+        YEAR_FULL: "Year {year} capacity reached",
+        MONTH_TAKEN: "Month {month}/{year} already allocated by Project {project_id}",
+        PASS2_YEAR_FULL: "Year {year} capacity reached (Pass 2, Attempt 1)",
+        DEALLOCATED: "Month {month}/{year} deallocated due to year {year} capacity enforcement.",
+        None: "Capacity/Month taken by other projects.",
+    },
+    "el": {
+        YEAR_FULL: "Το έτος {year} έφτασε τη μέγιστη χωρητικότητα",
+        MONTH_TAKEN: "Ο μήνας {month}/{year} είναι ήδη κατανεμημένος στο έργο {project_id}",
+        PASS2_YEAR_FULL: "Το έτος {year} έφτασε τη μέγιστη χωρητικότητα (Πέρασμα 2, Προσπάθεια 1)",
+        DEALLOCATED: "Ο μήνας {month}/{year} αφαιρέθηκε για να τηρηθεί η χωρητικότητα του έτους {year}.",
+        None: "Η χωρητικότητα ή οι μήνες καλύφθηκαν από άλλα έργα.",
+    },
+}
+
+
+def log_reason(project_data, *reason):
+    project_data["reasons_log"][reason] = None
+
+
+def reason_params(reason):
+    code, *params = reason
+    if code in (YEAR_FULL, PASS2_YEAR_FULL):
+        return {"year": params[0]}
+    year, month = month_from_index(params[0])
+    if code == MONTH_TAKEN:
+        return {"year": year, "month": month, "project_id": params[1]}
+    return {"year": year, "month": month}
+
+
+def reason_message(reason, language="en"):
+    return MESSAGES[language][reason[0]].format(**reason_params(reason))
+
+
+def reasons_text(reasons, language="en"):
+    """One line with the messages of ``reasons`` (the generic one if there are none)."""
+    if not reasons:
+        return MESSAGES[language][None]
+    return "; ".join(reason_message(tuple(reason), language) for reason in reasons)
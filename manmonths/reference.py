@@ -0,0 +1,364 @@
+# ------------------------------------------------
+# Κατανομή αναφοράς (παγωμένη, μην τη βελτιστοποιείτε)
+# ------------------------------------------------
+# Ο κώδικας κατανομής του αρχικού process_excel_data (app.py πριν χωριστεί σε
+# engine/render), αυτούσιος: δικές του συναρτήσεις ημερομηνιών (datetime,
+# relativedelta), μήνες ως (έτος, μήνας), dict κατάστασης με κλειδί (y, m) και
+# λόγοι ως κείμενο. Δεν χρησιμοποιεί τίποτα από το υπόλοιπο πακέτο, ώστε μια
+# αλλαγή στο periods/engine/reasons να μη «διορθώνει» και την αναφορά.
+#
+# Οι μόνες αλλαγές: διαβάζει τις γραμμές του reader.read_input αντί για το
+# φύλλο, οι εγγραφές στο φύλλο αφαιρέθηκαν, τα st.warning γίνονται λίστα
+# warnings, η χωρητικότητα και η σειρά ταξινόμησης είναι παράμετροι (default
+# οι αρχικές) και ο έλεγχος χωρητικότητας είναι ξεχωριστή συνάρτηση, για να
+# συγκρίνεται και μόνος του (βλ. golden). Αλλάζει μόνο αν αλλάξουν σκόπιμα οι
+# κανόνες της κατανομής.
+
+import re
+from datetime import datetime
+
+from dateutil.relativedelta import relativedelta
+
+MAX_YEARLY_CAPACITY = 11
+START_COL = 5
+
+
+def initial_order(x):
+    return (not x["is_yellow"], x["months_in_period_count"])
+
+
+# ------------------------------------------------
+# Συναρτήσεις ημερομηνιών
+# ------------------------------------------------
+def parse_date(text, is_start=True):
+    text = str(text).strip()
+    if "σήμερα" in text.lower() or "simera" in text.lower():
+        if not is_start:
+            return datetime.today()
+        else:
+            pass # This case is tricky for start date without end date context
+
+    if re.match(r"^\d{4}$", text):
+        if is_start:
+            return datetime.strptime("01/01/" + text, "%d/%m/%Y")
+        else:
+            return datetime.strptime("31/12/" + text, "%d/%m/%Y")
+    elif re.match(r"^\d{1,2}/\d{4}$", text):
+        if is_start:
+            return datetime.strptime("01/" + text, "%d/%m/%Y")
+        else:
+            d = datetime.strptime("01/" + text, "%d/%m/%Y")
+            return d + relativedelta(months=1) - relativedelta(days=1)
+    elif re.match(r"^\d{1,2}/\d{1,2}/\d{4}$", text):
+        return datetime.strptime(text, "%d/%m/%Y")
+    else:
+        raise ValueError(f"Unsupported date format: '{text}'. Expected 'YYYY', 'M/YYYY' or 'MM/YYYY', 'D/M/YYYY' or 'DD/MM/YYYY', or 'Σήμερα' (for end date).")
+
+def parse_period(p):
+    p_cleaned = str(p).strip().replace("—", "-").replace("–", "-")
+    if re.match(r"^\d{4}$", p_cleaned):
+        return parse_date(p_cleaned, True), parse_date(p_cleaned, False)
+
+    parts = p_cleaned.split("-")
+    if len(parts) != 2:
+        raise ValueError(f"Invalid period format: '{p}'. Expected 'YYYY' or 'START_DATE-END_DATE'.")
+    a, b = parts
+    return parse_date(a, True), parse_date(b, False)
+
+def month_range(start, end):
+    current = datetime(start.year, start.month, 1)
+    end = datetime(end.year, end.month, 1)
+    out = []
+    while current <= end:
+        out.append((current.year, current.month))
+        current += relativedelta(months=1)
+    return out
+
+
+def reference_allocate(rows, max_yearly_capacity=MAX_YEARLY_CAPACITY, sort_key=initial_order):
+    """Allocate the raw INPUT ``rows`` of reader.read_input as the original app did.
+
+    Returns a dict with the project dicts in allocation order (``reasons_log``
+    is a list of messages), ``years``, ``month_allocation_status``
+    ((year, month) -> project_id or None), ``yearly_am_totals``,
+    ``yearly_overages`` and the ``warnings`` the app showed, in order.
+    """
+    MAX_YEARLY_CAPACITY = max_yearly_capacity
+    warnings = []
+
+    data = []
+    all_months = set()
+    project_counter = 0 # Initialize project counter
+
+    total_all_projects_am = 0
+
+    for source_row in rows:
+        r = source_row["row"]
+        period = source_row["period"]
+        am_raw = source_row["am_raw"]
+        try:
+            am = int(am_raw) if am_raw is not None else 0
+        except (ValueError, TypeError):
+            am = 0
+
+        if not period or am == 0:
+            continue
+
+        try:
+            start, end = parse_period(str(period))
+        except ValueError as e:
+            warnings.append(f"Skipping row {r} due to period parsing error: {e}")
+            continue
+
+        months = month_range(start, end)
+        months_in_period_count = len(months)
+
+        if months_in_period_count > 0:
+            am_per_month_ratio = am / months_in_period_count
+        else:
+            am_per_month_ratio = 0
+
+        is_yellow = source_row["is_yellow"]
+
+        data.append({
+            "project_id": project_counter,
+            "period_str": period,
+            "original_am": am,
+            "months_in_period": months,
+            "months_in_period_count": months_in_period_count,
+            "am_per_month_ratio": am_per_month_ratio,
+            "allocated_am": 0,
+            "unallocated_am": am,
+            "is_yellow": is_yellow,
+            "excel_row": 0,
+            "reasons_log": []
+        })
+        project_counter += 1
+
+        for m in months:
+            all_months.add(m)
+
+        total_all_projects_am += am
+
+    all_months = sorted(all_months)
+    years = sorted(set(y for y,m in all_months))
+
+    data.sort(key=sort_key)
+
+    project_id_map = {proj['project_id']: proj for proj in data}
+
+    yearly_am_totals = {year: 0 for year in years}
+    month_allocation_status = {(y, m): None for y in years for m in range(1, 13)}
+
+    col = START_COL
+    month_col_map = {}
+
+    for y in years:
+        for m in range(1,13):
+            month_col_map[(y,m)] = col
+            col += 1
+
+    # ------------------------------------------------
+    # Greedy Allocation - Pass 1
+    # ------------------------------------------------
+    yearly_overages = {}
+
+    for project_idx, project_data in enumerate(data):
+        original_am = project_data["original_am"]
+        months_in_period = project_data["months_in_period"]
+        project_id = project_data["project_id"]
+        allocated_count = 0
+        unallocated_count = original_am
+
+        for (y, m) in sorted(months_in_period):
+            if allocated_count >= original_am:
+                break
+
+            if (y,m) in month_col_map:
+                if yearly_am_totals[y] >= MAX_YEARLY_CAPACITY:
+                    reason_text = f"Year {y} capacity reached"
+                    if reason_text not in project_data["reasons_log"]:
+                        project_data["reasons_log"].append(reason_text)
+                    continue
+
+                if month_allocation_status[(y,m)] is not None:
+                    occupying_project_id = month_allocation_status[(y,m)]
+                    reason_text = f"Month {m}/{y} already allocated by Project {occupying_project_id}"
+                    if reason_text not in project_data["reasons_log"]:
+                        project_data["reasons_log"].append(reason_text)
+                    continue
+
+                yearly_am_totals[y] += 1
+                month_allocation_status[(y,m)] = project_id
+                allocated_count += 1
+                unallocated_count -= 1
+
+        project_data["allocated_am"] = allocated_count
+        project_data["unallocated_am"] = unallocated_count
+
+    # ------------------------------------------------
+    # Greedy Allocation - Pass 2: Enforcement for zero-allocated projects
+    # ------------------------------------------------
+
+    projects_that_got_allocated_in_pass2 = []
+
+    for project_data in data:
+        if project_data["allocated_am"] == 0 and project_data["original_am"] > 0:
+            current_project_id = project_data["project_id"]
+            found_allocation_in_pass2 = False
+            project_data["reasons_log"] = []
+
+            for (y, m) in sorted(project_data["months_in_period"]):
+                if (y,m) in month_col_map and month_allocation_status[(y,m)] is None:
+                    if yearly_am_totals[y] >= MAX_YEARLY_CAPACITY:
+                        reason_text = f"Year {y} capacity reached (Pass 2, Attempt 1)"
+                        if reason_text not in project_data["reasons_log"]:
+                            project_data["reasons_log"].append(reason_text)
+                        continue
+
+                    month_allocation_status[(y,m)] = current_project_id
+                    yearly_am_totals[y] += 1
+                    project_data["allocated_am"] += 1
+                    project_data["unallocated_am"] -= 1
+
+                    found_allocation_in_pass2 = True
+                    projects_that_got_allocated_in_pass2.append(current_project_id)
+                    break
+
+            if found_allocation_in_pass2:
+                continue
+
+            for (y, m) in sorted(project_data["months_in_period"]):
+                if (y,m) in month_col_map:
+                    occupying_project_id = month_allocation_status[(y,m)]
+                    if occupying_project_id is not None and occupying_project_id != current_project_id:
+                        donor_project = project_id_map.get(occupying_project_id)
+                        if donor_project and not donor_project["is_yellow"] and donor_project["allocated_am"] > 1:
+                            donor_project["allocated_am"] -= 1
+                            donor_project["unallocated_am"] += 1
+
+                            month_allocation_status[(y,m)] = current_project_id
+                            project_data["allocated_am"] += 1
+                            project_data["unallocated_am"] -= 1
+
+                            found_allocation_in_pass2 = True
+                            projects_that_got_allocated_in_pass2.append(current_project_id)
+                            break
+
+            if found_allocation_in_pass2:
+                continue
+
+            for (y, m) in sorted(project_data["months_in_period"]):
+                if (y,m) in month_col_map:
+                    occupying_project_id = month_allocation_status[(y,m)]
+                    if occupying_project_id is not None and occupying_project_id != current_project_id:
+                        donor_project = project_id_map.get(occupying_project_id)
+                        if donor_project and donor_project["allocated_am"] > 1:
+                            donor_project["allocated_am"] -= 1
+                            donor_project["unallocated_am"] += 1
+
+                            month_allocation_status[(y,m)] = current_project_id
+                            project_data["allocated_am"] += 1
+                            project_data["unallocated_am"] -= 1
+
+                            found_allocation_in_pass2 = True
+                            projects_that_got_allocated_in_pass2.append(current_project_id)
+                            break
+
+    warnings += reference_enforce(
+        years, month_col_map, month_allocation_status, yearly_am_totals, project_id_map,
+        projects_that_got_allocated_in_pass2, MAX_YEARLY_CAPACITY,
+    )
+
+    for y in years:
+        if y in yearly_am_totals:
+            if yearly_am_totals[y] >= MAX_YEARLY_CAPACITY:
+                if yearly_am_totals[y] > MAX_YEARLY_CAPACITY:
+                    yearly_overages[y] = yearly_am_totals[y] - MAX_YEARLY_CAPACITY
+
+    return {
+        "projects": data,
+        "years": years,
+        "month_allocation_status": month_allocation_status,
+        "yearly_am_totals": yearly_am_totals,
+        "yearly_overages": yearly_overages,
+        "warnings": warnings,
+    }
+
+
+def reference_enforce(years, month_col_map, month_allocation_status, yearly_am_totals, project_id_map,
+                      projects_that_got_allocated_in_pass2, MAX_YEARLY_CAPACITY=MAX_YEARLY_CAPACITY):
+    """The original post-processing that enforces the yearly capacity; returns its warnings.
+
+    ``month_allocation_status`` and ``yearly_am_totals`` are updated in place,
+    and the donor projects' AM and ``reasons_log`` (a list of messages).
+    """
+    warnings = []
+
+    # ------------------------------------------------
+    # Post-processing: Enforce strict yearly capacity (11 person-months)
+    # ------------------------------------------------
+    for y in years:
+        while yearly_am_totals[y] > MAX_YEARLY_CAPACITY:
+            deallocated_a_month_in_this_iteration = False
+
+            allocated_months_in_year = []
+            for m_idx in range(1, 13):
+                month_key = (y, m_idx)
+                if month_key in month_col_map and month_allocation_status[month_key] is not None:
+                    occupying_project_id = month_allocation_status[month_key]
+                    project_info = project_id_map.get(occupying_project_id)
+                    if project_info:
+                        allocated_months_in_year.append((month_key, project_info))
+
+            month_to_deallocate_key = None
+            donor_project_id_for_deallocation = None
+
+            for month_key, project_info in allocated_months_in_year:
+                if not project_info["is_yellow"] and                    project_info["allocated_am"] > 1 and                    project_info["project_id"] not in projects_that_got_allocated_in_pass2:
+                    month_to_deallocate_key = month_key
+                    donor_project_id_for_deallocation = project_info["project_id"]
+                    break
+
+            if month_to_deallocate_key is None:
+                for month_key, project_info in allocated_months_in_year:
+                    if not project_info["is_yellow"] and project_info["allocated_am"] > 1:
+                        month_to_deallocate_key = month_key
+                        donor_project_id_for_deallocation = project_info["project_id"]
+                        break
+
+            if month_to_deallocate_key is None:
+                for month_key, project_info in allocated_months_in_year:
+                    if project_info["allocated_am"] > 1:
+                        month_to_deallocate_key = month_key
+                        donor_project_id_for_deallocation = project_info["project_id"]
+                        break
+
+            if month_to_deallocate_key is None:
+                for month_key, project_info in allocated_months_in_year:
+                    month_to_deallocate_key = month_key
+                    donor_project_id_for_deallocation = project_info["project_id"]
+                    break
+
+
+            if month_to_deallocate_key is not None and donor_project_id_for_deallocation is not None:
+                donor_project = project_id_map.get(donor_project_id_for_deallocation)
+                if donor_project:
+                    month_allocation_status[month_to_deallocate_key] = None
+                    yearly_am_totals[y] -= 1
+                    donor_project["allocated_am"] -= 1
+                    donor_project["unallocated_am"] += 1
+
+                    reason_text = f"Month {month_to_deallocate_key[1]}/{month_to_deallocate_key[0]} deallocated due to year {y} capacity enforcement."
+                    if reason_text not in donor_project["reasons_log"]:
+                        donor_project["reasons_log"].append(reason_text)
+
+                    deallocated_a_month_in_this_iteration = True
+
+            if deallocated_a_month_in_this_iteration:
+                continue
+            else:
+                warnings.append(f"Warning: No suitable month could be deallocated in year {y} to meet capacity (total: {yearly_am_totals[y]}). All remaining allocations might be protected by rules.")
+                break
+
+    return warnings
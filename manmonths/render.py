@@ -0,0 +1,325 @@
+# ------------------------------------------------
+# Απόδοση σε write-only workbook (φύλλα 'CV' και 'ΑΝΑΛΥΣΗ')
+# ------------------------------------------------
+# Το αποτέλεσμα γράφεται με write-only φύλλα: κάθε γραμμή δημιουργείται τη
+# στιγμή που γράφεται και το openpyxl τη στέλνει σε προσωρινό αρχείο, οπότε
+# ούτε το αντίγραφο 'CV' ούτε ο πίνακας 'ΑΝΑΛΥΣΗ' μένουν ολόκληρα στη μνήμη.
+#
+# Ένα write-only workbook δεν ανοίγει αρχείο, γι' αυτό ξεκινά με αντίγραφο των
+# πινάκων στυλ, του theme και των ιδιοτήτων του σκελετού
+# (template.template_workbook). Έτσι τα κελιά του σκελετού και τα NamedStyle
+# έχουν τα ίδια ids στυλ και στο νέο αρχείο. Οι γραμμές επικεφαλίδας (έτη,
+# μήνες, ετήσια σύνολα, με τις συγχωνεύσεις τους) είναι λίγες και χτίζονται σε
+# ένα βοηθητικό κανονικό φύλλο, ώστε τα περιγράμματα των συγχωνευμένων κελιών
+# να βγαίνουν όπως στο openpyxl. Το αρχείο αποθηκεύεται σε
+# SpooledTemporaryFile, που μεταφέρεται στο δίσκο πάνω από SPOOL_MAX_BYTES.
+
+import random
+import tempfile
+from copy import copy
+
+import openpyxl
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, PatternFill
+from openpyxl.styles.named_styles import NamedStyleList
+from openpyxl.utils import get_column_letter, quote_sheetname
+from openpyxl.utils.indexed_list import IndexedList
+from openpyxl.worksheet.worksheet import Worksheet
+
+from . import styles
+from .periods import month_index
+from .template import (
+    MONTH_ROW,
+    ROW_INDEX_FORMULA,
+    ROW_INDEX_MODES,
+    ROW_INDEX_VALUE,
+    START_COL,
+    START_ROW_DATA,
+    YEAR_ROW,
+    YEARLY_TOTAL_ROW,
+)
+
+# The MATCH formulas of 'ΑΝΑΛΥΣΗ' look up column B of 'CV'
+MATCH_COLUMN = 2
+CV_SHEET_TITLE = "CV"
+
+# Outputs up to this size stay in memory; larger ones go to a temporary file
+SPOOL_MAX_BYTES = 8 * 2**20
+
+_STYLE_TABLES = ("_fonts", "_fills", "_borders", "_alignments", "_protections", "_number_formats", "_cell_styles")
+_SHEET_LAYOUT = ("sheet_properties", "sheet_format", "views", "page_margins", "print_options", "HeaderFooter")
+
+
+def is_light_color(hex_color):
+    hex_color = hex_color.lstrip('#')
+    rgb = tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
+    luminance = (0.299 * rgb[0] + 0.587 * rgb[1] + 0.114 * rgb[2]) / 255
+    return luminance > 0.5
+
+
+def new_workbook(template_wb):
+    """Write-only workbook with the styles, theme and properties of ``template_wb``."""
+    wb = openpyxl.Workbook(write_only=True)
+    for name in _STYLE_TABLES:
+        setattr(wb, name, IndexedList(getattr(template_wb, name)))
+    # The named styles only hold ids into the (identical) tables copied above
+    wb._named_styles = NamedStyleList(template_wb._named_styles)
+    wb._table_styles = copy(template_wb._table_styles)
+    wb._differential_styles = copy(template_wb._differential_styles)
+    wb._date_formats = dict(template_wb._date_formats)
+    wb._timedelta_formats = dict(template_wb._timedelta_formats)
+    wb.loaded_theme = template_wb.loaded_theme
+    wb.properties = copy(template_wb.properties)
+    wb.custom_doc_props = copy(template_wb.custom_doc_props)
+    wb.calculation = copy(template_wb.calculation)
+    wb.security = copy(template_wb.security)
+    wb.views = [copy(view) for view in template_wb.views]
+    return wb
+
+
+def _styled_cell(ws, value, style_array):
+    cell = WriteOnlyCell(ws, value)
+    cell._style = copy(style_array)
+    return cell
+
+
+def write_cv_sheet(wb, cv_rows, cv_styles, column_widths, last_row_b, title=CV_SHEET_TITLE):
+    """Stream the 'CV' sheet from the ``cv_rows`` of ``reader.read_input``.
+
+    Every distinct style of the INPUT is set up once, on the first cell that
+    uses it; the other cells copy that cell's StyleArray, as openpyxl does in
+    copy_worksheet. ``cv_styles`` is the dict filled in while reading the rows.
+    """
+    cv_sheet = wb.create_sheet(title=title)
+    for col_idx, width in column_widths.items():
+        cv_sheet.column_dimensions[get_column_letter(col_idx)].width = width
+
+    looks = styles.overlays(wb)
+    prototypes = {}
+
+    for row_idx, row_cells in enumerate(cv_rows, start=1):
+        cells = {}
+        for col_idx, value, style_key in row_cells:
+            new_cell = WriteOnlyCell(cv_sheet, value)
+            cells[col_idx] = new_cell
+            if style_key is None:
+                continue
+
+            prototype = prototypes.get(style_key)
+            if prototype is None:
+                font, border, fill, number_format = cv_styles[style_key]
+                new_cell.font = copy(font)
+                new_cell.border = copy(border)
+                new_cell.fill = copy(fill)
+                new_cell.number_format = number_format
+                prototypes[style_key] = new_cell._style
+            else:
+                new_cell._style = copy(prototype)
+
+        # Α/Α replaces the value of column A; the INPUT cell's style stays under the look
+        base = getattr(cells.get(1), "_style", None)
+        if row_idx == 1:
+            cells[1] = _styled_cell(cv_sheet, 'Α/Α', styles.overlay(base, looks[styles.BOLD_CELL]))
+        elif row_idx <= last_row_b:
+            cells[1] = _styled_cell(cv_sheet, row_idx - 1, styles.overlay(base, looks[styles.CELL]))
+        cv_sheet.append([cells.get(c) for c in range(1, max(cells, default=0) + 1)])
+
+    return cv_sheet
+
+
+def _apply_look(cell, look):
+    cell._style = styles.overlay(cell._style, look)
+
+
+def _header_sheet(wb, template_ws, years, yearly_am_totals, max_yearly_capacity, summary_total):
+    """Build the header rows of 'ΑΝΑΛΥΣΗ' on a detached sheet.
+
+    Returns the sheet, the month -> column map and the first column after the grid.
+    """
+    ws = Worksheet(wb)
+    looks = styles.overlays(wb)
+    for (r, c), template_cell in template_ws._cells.items():
+        if r < START_ROW_DATA + 2:
+            cell = ws.cell(r, c, template_cell.value)
+            cell._style = copy(template_cell._style)
+
+    # ------------------------------------------------
+    # Build Years and Months Headers on 'ΑΝΑΛΥΣΗ' Sheet
+    # ------------------------------------------------
+    col = START_COL
+    month_col_map = {}
+
+    for y in years:
+        year_start_col = col
+        year_header_cell = ws.cell(YEAR_ROW, col)
+        _apply_look(year_header_cell, looks[styles.CELL])
+
+        r_color_func = lambda: random.randint(0,255)
+        random_color_hex = '%02X%02X%02X' % (r_color_func(), r_color_func(), r_color_func())
+        year_header_cell.fill = PatternFill(start_color=random_color_hex, end_color=random_color_hex, fill_type="solid")
+
+        if not is_light_color(random_color_hex):
+            year_header_cell.font = Font(color="FFFFFF")
+        else:
+            year_header_cell.font = Font(color="000000")
+
+        for m in range(1,13):
+            ws.cell(MONTH_ROW, col).value = m
+            _apply_look(ws.cell(MONTH_ROW, col), looks[styles.CELL])
+            if m > 1:
+                _apply_look(ws.cell(YEAR_ROW, col), looks[styles.CELL])
+            month_col_map[month_index(y, m)] = col
+            col += 1
+        year_end_col = col - 1
+
+        ws.merge_cells(start_row=YEAR_ROW, start_column=year_start_col, end_row=YEAR_ROW, end_column=year_end_col)
+        year_header_cell.value = y
+
+    ws.cell(YEARLY_TOTAL_ROW, 2).value = "ΕΤΗΣΙΑ ΣΥΝΟΛΑ"
+    _apply_look(ws.cell(YEARLY_TOTAL_ROW, 2), looks[styles.BOLD_CELL])
+
+    # ------------------------------------------------
+    # Set 'ΑΝΑΛΥΣΗ' Sheet Specific Headers and Styling
+    # ------------------------------------------------
+    ws['A5'] = 'Α/Α'
+    ws['B2'] = 'ΑΝΘΡΩΠΟΜΗΝΕΣ ΕΜΠΕΙΡΙΑΣ'
+    _apply_look(ws['B2'], looks[styles.SUMMARY_LABEL])
+
+    # ------------------------------------------------
+    # Yearly totals
+    # ------------------------------------------------
+    for y in years:
+        if y not in yearly_am_totals:
+            continue
+        year_start_col = month_col_map[month_index(y, 1)]
+        year_end_col = month_col_map[month_index(y, 12)]
+        ws.merge_cells(start_row=YEARLY_TOTAL_ROW, start_column=year_start_col, end_row=YEARLY_TOTAL_ROW, end_column=year_end_col)
+
+        total_cell = ws.cell(YEARLY_TOTAL_ROW, year_start_col)
+        total_cell.value = yearly_am_totals[y]
+        _apply_look(total_cell, looks[styles.TOTAL])
+
+        if yearly_am_totals[y] >= max_yearly_capacity:
+            _apply_look(ws.cell(YEAR_ROW, year_start_col), looks[styles.YEAR_FULL])
+            _apply_look(total_cell, looks[styles.TOTAL_FULL])
+        elif yearly_am_totals[y] > 0:
+            _apply_look(total_cell, looks[styles.TOTAL_PARTIAL])
+
+    ws['C2'].value = summary_total
+    _apply_look(ws['C2'], looks[styles.SUMMARY_TOTAL])
+
+    return ws, month_col_map, col
+
+
+def _copy_layout(template_ws, ws):
+    for name in _SHEET_LAYOUT:
+        setattr(ws, name, copy(getattr(template_ws, name)))
+    for key, dimension in template_ws.column_dimensions.items():
+        dimension = copy(dimension)
+        dimension.parent = ws
+        ws.column_dimensions[key] = dimension
+    for key, dimension in template_ws.row_dimensions.items():
+        dimension = copy(dimension)
+        dimension.parent = ws
+        ws.row_dimensions[key] = dimension
+    for cell_range in template_ws.merged_cells.ranges:
+        ws.merged_cells.add(cell_range.coord)
+
+
+def write_analysis_sheet(wb, template_ws, allocation, max_yearly_capacity, summary_total, last_row_b,
+                         row_index=ROW_INDEX_FORMULA, title=None, cv_title=CV_SHEET_TITLE):
+    """Stream the 'ΑΝΑΛΥΣΗ' sheet: template layout, headers, one row per project.
+
+    With ``row_index="value"`` column A holds the Α/Α of the project's own 'CV'
+    row (its INPUT row - 1) instead of a MATCH formula, and the workbook is no
+    longer recalculated on open. ``title`` (default: the template's) and
+    ``cv_title`` name the sheet and its 'CV' sheet.
+    """
+    if row_index not in ROW_INDEX_MODES:
+        raise ValueError(f"Unknown row index mode: '{row_index}'. Expected one of: {', '.join(ROW_INDEX_MODES)}.")
+    if row_index == ROW_INDEX_VALUE:
+        wb.calculation.fullCalcOnLoad = None
+
+    ws = wb.create_sheet(title=title or template_ws.title)
+    cv_ref = cv_title if cv_title == CV_SHEET_TITLE else quote_sheetname(cv_title)
+    _copy_layout(template_ws, ws)
+
+    header, month_col_map, end_col = _header_sheet(
+        wb, template_ws, allocation["years"], allocation["yearly_am_totals"], max_yearly_capacity, summary_total,
+    )
+    for cell_range in header.merged_cells.ranges:
+        ws.merged_cells.add(cell_range.coord)
+    for c_width in range(START_COL, end_col):
+        ws.column_dimensions[get_column_letter(c_width)].width = 2.5
+
+    allocated_cols_by_project = {}
+    for month_idx, project_id in allocation["assignment"].items():
+        allocated_cols_by_project.setdefault(project_id, set()).add(month_col_map[month_idx])
+
+    projects = allocation["projects"]
+    first_data_row = START_ROW_DATA + 2
+    last_row = max(template_ws.max_row, first_data_row + len(projects) - 1)
+
+    # Cells of the template that no project writes keep their template style
+    template_rows = {}
+    for (r, c), template_cell in template_ws._cells.items():
+        template_rows.setdefault(r, []).append((c, template_cell))
+
+    # A project cell gets its look over the template cell at the same place, if any
+    looks = styles.overlays(wb)
+    plain = {name: styles.overlay(None, look) for name, look in looks.items()}
+    over_template = {}
+
+    def look_style(r, c, name):
+        template_cell = template_ws._cells.get((r, c))
+        if template_cell is None:
+            return plain[name]
+        key = (r, c, name)
+        if key not in over_template:
+            over_template[key] = styles.overlay(template_cell._style, looks[name])
+        return over_template[key]
+
+    for r in range(1, first_data_row):
+        cells = {c: _styled_cell(ws, cell.value, cell._style) for (row, c), cell in header._cells.items() if row == r}
+        ws.append([cells.get(c) for c in range(1, max(cells, default=0) + 1)])
+
+    for r in range(first_data_row, last_row + 1):
+        match_formula = f'=MATCH(B{r},{cv_ref}!$B$2:$B${last_row_b},0)'
+        cells = {}
+        if r - first_data_row < len(projects):
+            project_data = projects[r - first_data_row]
+            project_data["excel_row"] = r
+            if row_index == ROW_INDEX_VALUE:
+                cells[1] = _styled_cell(ws, project_data["input_row"] - 1, look_style(r, 1, styles.CELL))
+            else:
+                cells[1] = _styled_cell(ws, match_formula, look_style(r, 1, styles.CELL))
+            cells[2] = _styled_cell(
+                ws, project_data["period_str"],
+                look_style(r, 2, styles.YELLOW_PERIOD if project_data["is_yellow"] else styles.CELL),
+            )
+            cells[3] = _styled_cell(
+                ws, project_data["original_am"],
+                look_style(r, 3, styles.AM_UNALLOCATED if project_data["unallocated_am"] > 0 else styles.AM_ALLOCATED),
+            )
+            allocated_cols = allocated_cols_by_project.get(project_data["project_id"], ())
+            for c_grid in range(START_COL, end_col):
+                if c_grid in allocated_cols:
+                    cells[c_grid] = _styled_cell(ws, 'X', look_style(r, c_grid, styles.ALLOCATED))
+                else:
+                    cells[c_grid] = _styled_cell(ws, None, look_style(r, c_grid, styles.CELL))
+        for c, template_cell in template_rows.get(r, ()):
+            if c not in cells:
+                cells[c] = _styled_cell(ws, template_cell.value, template_cell._style)
+        if r == first_data_row and row_index == ROW_INDEX_FORMULA:
+            cells.setdefault(1, WriteOnlyCell(ws)).value = match_formula
+        ws.append([cells.get(c) for c in range(1, max(cells, default=0) + 1)])
+
+    return ws
+
+
+def save_workbook(wb):
+    """Save to a SpooledTemporaryFile, rewound; the caller owns (and closes) it."""
+    output = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES)
+    wb.save(output)
+    output.seek(0)
+    return output
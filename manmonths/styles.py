@@ -0,0 +1,102 @@
+# ------------------------------------------------
+# Κοινά στυλ (NamedStyle)
+# ------------------------------------------------
+# Όλες οι εμφανίσεις που χρησιμοποιεί το εργαλείο δηλώνονται μία φορά ως
+# NamedStyle στο workbook. Ένα κελί παίρνει μόνο τα μέρη που ορίζει η εμφάνιση
+# (βλ. overlay), πάνω στο στυλ που ήδη έχει από το template ή το INPUT, όπως οι
+# αρχικές αναθέσεις .border/.fill/.font: η γραμματοσειρά και η στοίχιση του
+# template μένουν. Έτσι δεν δημιουργούνται νέα Font/PatternFill/Border
+# αντικείμενα μέσα στους βρόχους και ο πίνακας στυλ του αρχείου μένει μικρός.
+
+from copy import copy
+
+from openpyxl.styles import Alignment, Border, Font, NamedStyle, PatternFill, Side
+from openpyxl.styles.cell_style import StyleArray
+
+# Define colors
+yellow = PatternFill(start_color="FFFF00", end_color="FFFF00", fill_type="solid")
+red_fill = PatternFill(start_color="FF0000", end_color="FF0000", fill_type="solid")
+green_fill = PatternFill(start_color="00FF00", end_color="00FF00", fill_type="solid")
+orange_fill = PatternFill(start_color="FFC000", end_color="FFC000", fill_type="solid")
+
+# Define thin border style
+thin_border = Border(left=Side(style='thin'),
+                     right=Side(style='thin'),
+                     top=Side(style='thin'),
+                     bottom=Side(style='thin'))
+
+centered = Alignment(horizontal='center', vertical='center')
+
+# StyleArray fields of the (font, fill, border, alignment) parts of a look
+_PART_FIELDS = ("fontId", "fillId", "borderId", "alignmentId")
+
+# Style names
+CELL = "AM Cell"
+BOLD_CELL = "AM Bold Cell"
+ALLOCATED = "AM Allocated"
+YELLOW_PERIOD = "AM Yellow Period"
+AM_ALLOCATED = "AM Fully Allocated"
+AM_UNALLOCATED = "AM Unallocated"
+YEAR_FULL = "AM Year Full"
+TOTAL = "AM Total"
+TOTAL_PARTIAL = "AM Total Partial"
+TOTAL_FULL = "AM Total Full"
+SUMMARY_LABEL = "AM Summary Label"
+SUMMARY_TOTAL = "AM Summary Total"
+
+
+def _style_definitions():
+    # name: (font, fill, border, alignment); None keeps the cell's own part
+    # (the NamedStyle itself uses the workbook default)
+    return {
+        CELL: (None, None, thin_border, None),
+        BOLD_CELL: (Font(bold=True), None, thin_border, None),
+        ALLOCATED: (None, yellow, thin_border, None),
+        YELLOW_PERIOD: (None, yellow, thin_border, None),
+        AM_ALLOCATED: (Font(color="000000"), None, thin_border, None),
+        AM_UNALLOCATED: (Font(color="FF0000", bold=True), None, thin_border, None),
+        YEAR_FULL: (Font(color="FFFFFF", bold=True), red_fill, thin_border, None),
+        TOTAL: (Font(bold=True), None, thin_border, centered),
+        TOTAL_PARTIAL: (Font(color="000000", bold=True), green_fill, thin_border, centered),
+        TOTAL_FULL: (Font(color="FFFFFF", bold=True), red_fill, thin_border, centered),
+        SUMMARY_LABEL: (None, orange_fill, None, None),
+        SUMMARY_TOTAL: (Font(bold=True), orange_fill, thin_border, None),
+    }
+
+
+def register_styles(wb):
+    """Add the tool's named styles to ``wb`` (once; existing names are kept)."""
+    # Looks without their own font use the workbook's default font (fonts[0])
+    default_font = wb._fonts[0] if len(wb._fonts) else Font()
+    for name, (font, fill, border, alignment) in _style_definitions().items():
+        if name in wb.named_styles:
+            continue
+        wb.add_named_style(NamedStyle(
+            name=name,
+            font=copy(font or default_font),
+            fill=copy(fill or PatternFill()),
+            border=copy(border or Border()),
+            alignment=copy(alignment or Alignment()),
+        ))
+    return wb
+
+
+def overlays(wb):
+    """Style name -> {StyleArray field: id} of the parts that look sets, from ``wb``'s named styles."""
+    definitions = _style_definitions()
+    looks = {}
+    for style in wb._named_styles:
+        parts = definitions.get(style.name)
+        if parts is None:
+            continue
+        ids = style.as_tuple()
+        looks[style.name] = {field: getattr(ids, field) for field, part in zip(_PART_FIELDS, parts) if part is not None}
+    return looks
+
+
+def overlay(style_array, look):
+    """Copy of a cell's ``style_array`` (None: unstyled) with the parts of ``look`` (an overlays() entry) replaced."""
+    style_array = StyleArray() if style_array is None else copy(style_array)
+    for field, style_id in look.items():
+        setattr(style_array, field, style_id)
+    return style_array
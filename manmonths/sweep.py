@@ -0,0 +1,144 @@
+# ------------------------------------------------
+# Σενάρια "what-if" (χωρητικότητα x σειρά κατανομής)
+# ------------------------------------------------
+# python -m manmonths.sweep INPUT.xlsx --capacities 10 11 12 --orders yellow_short_first long_first
+#                           [--render 12 long_first -o out.xlsx]
+#
+# Το INPUT διαβάζεται μία φορά (χωρίς φύλλο 'CV') και ο πυρήνας κατανομής
+# τρέχει για κάθε συνδυασμό χωρητικότητας, σειράς και αλγορίθμου σε παράλληλα
+# processes, χωρίς workbook. Επιστρέφεται πίνακας σύγκρισης με κατανεμημένους
+# και μη κατανεμημένους ΑΜ ανά σενάριο. Μόνο το σενάριο που επιλέγεται
+# αποδίδεται σε Excel (process_excel_data με τις ίδιες ρυθμίσεις).
+
+import argparse
+import itertools
+import shutil
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from .diagnostics import ERROR, MISSING_COLUMNS, diagnostic
+from .engine import DEFAULT_ORDER, ORDERS, SOLVERS, allocate
+from .pipeline import build_projects, new_counters
+from .reader import read_input
+
+DEFAULT_CAPACITIES = (10, 11, 12)
+
+
+def run_scenario(projects, max_yearly_capacity, order, solver):
+    """Allocate one scenario and summarise it (one row of the comparison table)."""
+    allocation = allocate(projects, max_yearly_capacity, solver=solver, order=order)
+    projects = allocation["projects"]
+    yearly_am_totals = allocation["yearly_am_totals"]
+    return {
+        "max_yearly_capacity": max_yearly_capacity,
+        "order": order,
+        "solver": solver,
+        "allocated_am": sum(proj["allocated_am"] for proj in projects),
+        "unallocated_am": sum(proj["unallocated_am"] for proj in projects),
+        "yellow_unallocated_am": sum(proj["unallocated_am"] for proj in projects if proj["is_yellow"]),
+        "projects_with_unallocated": sum(1 for proj in projects if proj["unallocated_am"] > 0),
+        "full_years": sum(1 for total in yearly_am_totals.values() if total >= max_yearly_capacity),
+    }
+
+
+def sweep_projects(projects, capacities=DEFAULT_CAPACITIES, orders=(DEFAULT_ORDER,), solvers=("greedy",),
+                   workers=None):
+    """Run every (capacity, order, solver) scenario; rows in grid order.
+
+    Each worker gets its own copy of ``projects``. ``workers=1`` runs the
+    scenarios in this process on copies.
+    """
+    grid = list(itertools.product(capacities, orders, solvers))
+    for _, order, solver in grid:
+        if order not in ORDERS:
+            raise ValueError(f"Unknown allocation order: '{order}'. Expected one of: {', '.join(ORDERS)}.")
+        if solver not in SOLVERS:
+            raise ValueError(f"Unknown solver: '{solver}'. Expected one of: {', '.join(SOLVERS)}.")
+
+    if workers == 1:
+        return [
+            run_scenario([dict(proj, reasons_log={}) for proj in projects], *scenario) for scenario in grid
+        ]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(run_scenario, itertools.repeat(projects), *zip(*grid)))
+
+
+def sweep(uploaded_input_file, capacities=DEFAULT_CAPACITIES, orders=(DEFAULT_ORDER,), solvers=("greedy",),
+          workers=None):
+    """Read one INPUT and compare the allocation over a grid of scenarios.
+
+    Returns a dict with the comparison ``scenarios`` rows and the
+    ``diagnostics`` of reading the INPUT (``scenarios`` is empty on errors).
+    """
+    diagnostics = []
+    try:
+        source = read_input(uploaded_input_file, cv_columns=())
+    except ValueError as e:
+        return {"scenarios": [], "diagnostics": [diagnostic(ERROR, MISSING_COLUMNS, str(e))]}
+
+    projects = build_projects(source["rows"], diagnostics, new_counters())
+    return {
+        "scenarios": sweep_projects(projects, capacities, orders, solvers, workers),
+        "diagnostics": diagnostics,
+    }
+
+
+def format_table(scenarios):
+    header = ("capacity", "order", "solver", "allocated", "unallocated", "yellow unalloc.", "projects unalloc.")
+    rows = [
+        (s["max_yearly_capacity"], s["order"], s["solver"], s["allocated_am"], s["unallocated_am"],
+         s["yellow_unallocated_am"], s["projects_with_unallocated"])
+        for s in scenarios
+    ]
+    widths = [max(len(str(value)) for value in column) for column in zip(header, *rows)]
+    return "\n".join(
+        "  ".join(str(value).ljust(width) for value, width in zip(row, widths)) for row in (header, *rows)
+    )
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m manmonths.sweep",
+                                     description="Σύγκριση σεναρίων χωρητικότητας και σειράς κατανομής.")
+    parser.add_argument("input", help="INPUT .xlsx")
+    parser.add_argument("--capacities", type=int, nargs="+", default=list(DEFAULT_CAPACITIES),
+                        help="Μέγιστες ετήσιες χωρητικότητες")
+    parser.add_argument("--orders", nargs="+", choices=list(ORDERS), default=[DEFAULT_ORDER],
+                        help="Σειρές κατανομής")
+    parser.add_argument("--solvers", nargs="+", choices=list(SOLVERS), default=["greedy"])
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Πλήθος processes")
+    parser.add_argument("--render", nargs=2, metavar=("CAPACITY", "ORDER"),
+                        help="Απόδοση ενός σεναρίου σε Excel (με τον πρώτο αλγόριθμο του --solvers)")
+    parser.add_argument("-o", "--output", default=None, help="Αρχείο Excel για το --render")
+    parser.add_argument("--template", default=None, help="Template για το --render")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    with open(args.input, "rb") as f:
+        result = sweep(f, args.capacities, args.orders, args.solvers, args.workers)
+    for diag in result["diagnostics"]:
+        print(diag["message"], file=sys.stderr)
+    if not result["scenarios"]:
+        return 2
+    print(format_table(result["scenarios"]))
+
+    if args.render:
+        from .cli import output_file_name
+        from .pipeline import process_excel_data
+        from .template import TEMPLATE_FILE_NAME
+
+        capacity, order = int(args.render[0]), args.render[1]
+        with open(args.input, "rb") as f:
+            run = process_excel_data(args.template or TEMPLATE_FILE_NAME, f, solver=args.solvers[0],
+                                     max_yearly_capacity=capacity, order=order)
+        output_path = args.output or output_file_name(args.input)
+        with run["output"] as output, open(output_path, "wb") as f:
+            shutil.copyfileobj(output, f)
+        print(f"{capacity} / {order} -> {output_path}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
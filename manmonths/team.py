@@ -0,0 +1,211 @@
+# ------------------------------------------------
+# Ομάδα έργου: πολλά CV σε κοινό πίνακα μηνών
+# ------------------------------------------------
+# python -m manmonths.team <φάκελος ή glob> [...] -o team.xlsx [--json team.json]
+#
+# Κάθε CV κατανέμεται χωριστά (παράλληλα, χωρίς template). Οι κατανομές
+# μπαίνουν σε έναν πυκνό πίνακα άτομα x μήνες: ένα bytearray με μία γραμμή
+# ανά άτομο και μία στήλη ανά μήνα, με αφετηρία τον Ιανουάριο του πρώτου έτους
+# της ομάδας (1 = ο μήνας είναι κατανεμημένος). Τα ετήσια σύνολα βγαίνουν από
+# αθροίσματα slices και οι μήνες με ταυτόχρονη απασχόληση από αθροίσματα
+# στηλών, χωρίς dicts ανά μήνα. Γράφεται ένα συγκεντρωτικό φύλλο 'ΟΜΑΔΑ'.
+
+import argparse
+import io
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from .engine import DEFAULT_ORDER, MAX_YEARLY_CAPACITY, SOLVERS, allocate
+from .pipeline import build_projects, new_counters
+from .reader import read_input
+
+TEAM_SHEET_TITLE = "ΟΜΑΔΑ"
+
+
+def allocate_person(input_path, solver="greedy", max_yearly_capacity=MAX_YEARLY_CAPACITY, order=DEFAULT_ORDER):
+    """Worker entry point: allocate one CV and return its allocated months."""
+    person = {"name": os.path.splitext(os.path.basename(input_path))[0], "input": input_path, "error": None}
+    try:
+        with open(input_path, "rb") as f:
+            source = read_input(f, cv_columns=())
+    except Exception as e: # one bad CV must not stop the team
+        person.update(error=f"{type(e).__name__}: {e}", months=[], requested_am=0, unallocated_am=0)
+        return person
+
+    projects = build_projects(source["rows"], [], new_counters())
+    allocation = allocate(projects, max_yearly_capacity, solver=solver, order=order)
+    person.update(
+        months=sorted(allocation["assignment"]),
+        requested_am=sum(proj["original_am"] for proj in projects),
+        unallocated_am=sum(proj["unallocated_am"] for proj in projects),
+    )
+    return person
+
+
+def team_grid(people):
+    """Pack the people's allocated months into one people x months bytearray.
+
+    Returns ``(grid, first_year, span)``; row ``i`` of person ``i`` is
+    ``grid[i * span:(i + 1) * span]`` and column 0 is January of ``first_year``.
+    """
+    all_months = [month_idx for person in people for month_idx in person["months"][:1] + person["months"][-1:]]
+    if not all_months:
+        return bytearray(), 0, 0
+    first_year = min(all_months) // 12
+    span = (max(all_months) // 12 - first_year + 1) * 12
+    base = first_year * 12
+
+    grid = bytearray(len(people) * span)
+    for row, person in enumerate(people):
+        offset = row * span - base
+        for month_idx in person["months"]:
+            grid[offset + month_idx] = 1
+    return grid, first_year, span
+
+
+def team_summary(people, max_yearly_capacity=MAX_YEARLY_CAPACITY):
+    """Team-wide yearly totals, people at the yearly cap and monthly headcount."""
+    grid, first_year, span = team_grid(people)
+    years = [first_year + y_off for y_off in range(span // 12)]
+    rows = [grid[row * span:(row + 1) * span] for row in range(len(people))]
+
+    person_totals = [[sum(row[y_off * 12:y_off * 12 + 12]) for y_off in range(len(years))] for row in rows]
+    # Column sums: how many people are allocated in each month
+    headcount = list(map(sum, zip(*rows))) if rows else []
+
+    team_yearly_totals = {y: sum(totals[y_off] for totals in person_totals) for y_off, y in enumerate(years)}
+    at_cap = {
+        y: [person["name"] for person, totals in zip(people, person_totals) if totals[y_off] >= max_yearly_capacity]
+        for y_off, y in enumerate(years)
+    }
+    peak = max(headcount, default=0)
+
+    return {
+        "max_yearly_capacity": max_yearly_capacity,
+        "years": years,
+        "people": [
+            {
+                "name": person["name"],
+                "input": person["input"],
+                "error": person["error"],
+                "yearly_am_totals": dict(zip(years, totals)),
+                "allocated_am": sum(totals),
+                "requested_am": person["requested_am"],
+                "unallocated_am": person["unallocated_am"],
+            }
+            for person, totals in zip(people, person_totals)
+        ],
+        "team_yearly_totals": team_yearly_totals,
+        "at_cap": {y: names for y, names in at_cap.items() if names},
+        "monthly_headcount": {
+            f"{first_year + pos // 12}-{pos % 12 + 1:02d}": count for pos, count in enumerate(headcount) if count
+        },
+        "peak_headcount": peak,
+        "peak_months": [
+            f"{first_year + pos // 12}-{pos % 12 + 1:02d}" for pos, count in enumerate(headcount) if peak and count == peak
+        ],
+    }
+
+
+def allocate_team(input_paths, solver="greedy", max_yearly_capacity=MAX_YEARLY_CAPACITY, order=DEFAULT_ORDER,
+                  workers=None):
+    """Allocate every CV in a process pool and summarise the team."""
+    worker = partial(allocate_person, solver=solver, max_yearly_capacity=max_yearly_capacity, order=order)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        people = list(pool.map(worker, input_paths))
+    return team_summary(people, max_yearly_capacity)
+
+
+def write_team_workbook(summary):
+    """Consolidated 'ΟΜΑΔΑ' sheet: people x years, team totals, people at the cap."""
+    import openpyxl
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font
+
+    from .styles import orange_fill, red_fill
+
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet(TEAM_SHEET_TITLE)
+    bold = Font(bold=True)
+    full_font = Font(color="FFFFFF", bold=True)
+    cap = summary["max_yearly_capacity"]
+
+    def cell(value, font=None, fill=None):
+        c = WriteOnlyCell(ws, value=value)
+        if font is not None:
+            c.font = font
+        if fill is not None:
+            c.fill = fill
+        return c
+
+    ws.append([cell(h, bold) for h in ("ΟΝΟΜΑ", *summary["years"], "ΣΥΝΟΛΟ", "ΜΗ ΚΑΤΑΝΕΜΗΜΕΝΟΙ ΑΜ")])
+    for person in summary["people"]:
+        totals = [person["yearly_am_totals"][y] for y in summary["years"]]
+        ws.append([
+            cell(person["name"]),
+            *[cell(total or None, *((full_font, red_fill) if total >= cap else ())) for total in totals],
+            cell(person["allocated_am"], bold),
+            cell(person["unallocated_am"] or None),
+        ])
+    ws.append([
+        cell("ΣΥΝΟΛΟ ΟΜΑΔΑΣ", bold, orange_fill),
+        *[cell(summary["team_yearly_totals"][y], bold, orange_fill) for y in summary["years"]],
+        cell(sum(summary["team_yearly_totals"].values()), bold, orange_fill),
+        cell(sum(person["unallocated_am"] for person in summary["people"]), bold, orange_fill),
+    ])
+    ws.append([
+        cell("ΑΤΟΜΑ ΣΤΟ ΟΡΙΟ", bold),
+        *[cell(len(summary["at_cap"].get(y, ())) or None) for y in summary["years"]],
+    ])
+
+    buffer = io.BytesIO()
+    wb.save(buffer)
+    buffer.seek(0)
+    return buffer
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m manmonths.team",
+                                     description="Συγκεντρωτική εικόνα ομάδας από πολλά INPUT excel.")
+    parser.add_argument("inputs", nargs="+", help="Φάκελοι ή glob patterns με INPUT .xlsx (ένα ανά άτομο)")
+    parser.add_argument("-o", "--output", default="ΟΜΑΔΑ.xlsx", help="Συγκεντρωτικό Excel (default: ΟΜΑΔΑ.xlsx)")
+    parser.add_argument("--json", default=None, help="Αρχείο JSON με την πλήρη σύνοψη")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Πλήθος processes")
+    parser.add_argument("--solver", choices=list(SOLVERS), default="greedy")
+    parser.add_argument("--capacity", type=int, default=MAX_YEARLY_CAPACITY, help="Μέγιστη ετήσια χωρητικότητα")
+    return parser
+
+
+def main(argv=None):
+    from .cli import collect_inputs
+
+    args = build_parser().parse_args(argv)
+    input_paths = collect_inputs(args.inputs)
+    if not input_paths:
+        print("Δεν βρέθηκαν αρχεία INPUT.", file=sys.stderr)
+        return 2
+
+    summary = allocate_team(input_paths, solver=args.solver, max_yearly_capacity=args.capacity,
+                            workers=args.workers)
+    with open(args.output, "wb") as f:
+        f.write(write_team_workbook(summary).getbuffer())
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+
+    for person in summary["people"]:
+        if person["error"]:
+            print(f"ERR {person['name']}: {person['error']}", file=sys.stderr)
+    print(
+        f"{len(summary['people'])} άτομα, ΑΜ ομάδας: {sum(summary['team_yearly_totals'].values())}, "
+        f"μέγιστη ταυτόχρονη απασχόληση: {summary['peak_headcount']} -> {args.output}",
+        file=sys.stderr,
+    )
+    return 0 if not any(person["error"] for person in summary["people"]) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+# ------------------------------------------------
+# TEMPLATE (καθαρός σκελετός, cache ανά process)
+# ------------------------------------------------
+# Το template ανοίγει, καθαρίζεται και αποθηκεύεται σε bytes μία φορά ανά
+# process. Ο σκελετός φορτώνεται ξανά μία φορά σε workbook, από το οποίο κάθε
+# εκτέλεση αντιγράφει στυλ και διάταξη (βλ. render). Το cache ακυρώνεται όταν
+# αλλάξει το mtime του αρχείου. Το openpyxl φορτώνεται μόνο
+# όταν χρειαστεί, ώστε οι σταθερές του layout να εισάγονται φθηνά.
+
+import io
+import os
+import threading
+
+TEMPLATE_FILE_NAME = "AM TEST 1.xlsx"
+
+# Layout of the 'ΑΝΑΛΥΣΗ' sheet
+START_ROW_DATA = 4
+YEAR_ROW = 2
+MONTH_ROW = 3
+YEARLY_TOTAL_ROW = START_ROW_DATA + 1
+START_COL = 5
+
+# Column A of 'ΑΝΑΛΥΣΗ' (Α/Α of the project's row in 'CV'): a MATCH formula per
+# row, recalculated on open, or the number itself (no formulas to recalculate)
+ROW_INDEX_FORMULA = "formula"
+ROW_INDEX_VALUE = "value"
+ROW_INDEX_MODES = (ROW_INDEX_FORMULA, ROW_INDEX_VALUE)
+
+# Output of an INPUT with one sheet per person (see multisheet): one workbook
+# with a pair of sheets per person, or one workbook per person in a zip
+MERGED = "merged"
+ZIP = "zip"
+LAYOUTS = (MERGED, ZIP)
+
+_skeleton_cache = {}
+_workbook_cache = {}
+_skeleton_lock = threading.Lock()
+
+
+def strip_template(wb):
+    import openpyxl
+    from openpyxl.styles import PatternFill
+
+    from .styles import register_styles
+
+    ws = wb.active # This is the sheet that will become 'ΑΝΑΛΥΣΗ'
+    ws.freeze_panes = 'D1'
+    ws.title = 'ΑΝΑΛΥΣΗ'
+
+    merged_cells_to_unmerge = []
+    for cell_range_str in list(ws.merged_cells.ranges):
+        min_col_mc, min_row_mc, max_col_mc, max_row_mc = openpyxl.utils.cell.range_boundaries(str(cell_range_str))
+        if any(min_row_mc <= r <= max_row_mc for r in (YEAR_ROW, MONTH_ROW, START_ROW_DATA, YEARLY_TOTAL_ROW)):
+            merged_cells_to_unmerge.append(cell_range_str)
+
+    for cell_range_str in merged_cells_to_unmerge:
+        ws.unmerge_cells(str(cell_range_str))
+
+    # Columns past the template's own width hold nothing to clear
+    max_col_to_clear = ws.max_column + 1
+    empty_fill = PatternFill()
+
+    for r_clear in range(YEAR_ROW, ws.max_row + 1):
+        for c_clear in range(1, max_col_to_clear):
+            cell = ws.cell(r_clear, c_clear)
+            cell.value = None
+            cell.fill = empty_fill
+
+    register_styles(wb)
+    return wb
+
+
+def template_version(template_path=TEMPLATE_FILE_NAME):
+    """Identify the current contents of the template (path and mtime)."""
+    path = os.path.abspath(template_path)
+    return path, os.stat(path).st_mtime_ns
+
+
+def template_skeleton(template_path=TEMPLATE_FILE_NAME):
+    """Return the cleaned template as xlsx bytes, cached per (path, mtime)."""
+    key = template_version(template_path)
+    path = key[0]
+
+    with _skeleton_lock:
+        if key not in _skeleton_cache:
+            import openpyxl
+
+            wb = strip_template(openpyxl.load_workbook(path))
+            buffer = io.BytesIO()
+            wb.save(buffer)
+            # Only the current version of each template is kept
+            for stale_key in [k for k in _skeleton_cache if k[0] == path]:
+                del _skeleton_cache[stale_key]
+            _skeleton_cache[key] = buffer.getvalue()
+        return _skeleton_cache[key]
+
+
+def template_workbook(template_path=TEMPLATE_FILE_NAME):
+    """Return the cleaned template as a workbook, cached per (path, mtime).
+
+    The workbook is shared by every run of the process and must not be modified.
+    """
+    key = template_version(template_path)
+    skeleton = template_skeleton(template_path)
+
+    with _skeleton_lock:
+        if key not in _workbook_cache:
+            import openpyxl
+
+            for stale_key in [k for k in _workbook_cache if k[0] == key[0]]:
+                del _workbook_cache[stale_key]
+            _workbook_cache[key] = openpyxl.load_workbook(io.BytesIO(skeleton))
+        return _workbook_cache[key]
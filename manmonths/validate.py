@@ -0,0 +1,143 @@
+# ------------------------------------------------
+# Έλεγχος INPUT χωρίς επεξεργασία (dry run)
+# ------------------------------------------------
+# python -m manmonths.validate <αρχεία .xlsx> [...] [--json]
+#
+# Το INPUT διαβάζεται σε read-only mode χωρίς αντίγραφο του φύλλου 'CV' και
+# ελέγχονται οι στήλες, η σύνταξη των περιόδων, οι τιμές ΑΜ και αν οι ΑΜ
+# χωρούν στους μήνες της περιόδου. Δεν ανοίγει το template και δεν γίνεται
+# κατανομή. Επιστρέφεται λίστα διαγνωστικών (βλ. diagnostics).
+
+import argparse
+import json
+import sys
+
+from .diagnostics import (
+    AM_EXCEEDS_PERIOD,
+    ERROR,
+    INVALID_AM,
+    INVALID_WORKBOOK,
+    MISSING_COLUMNS,
+    MISSING_VALUE,
+    NEGATIVE_AM,
+    PERIOD_PARSE_ERROR,
+    WARNING,
+    diagnostic,
+    has_errors,
+)
+from .periods import months_in_range, parse_period_range, today_index
+from .reader import read_input
+
+
+def _am_value(am_raw):
+    # (value the pipeline will use, problem or None); the pipeline takes int(am_raw)
+    if isinstance(am_raw, bool):
+        return int(am_raw), f"not a number, {int(am_raw)} will be used"
+    if isinstance(am_raw, int):
+        return am_raw, None
+    if isinstance(am_raw, float):
+        return int(am_raw), None if am_raw.is_integer() else f"not an integer, {int(am_raw)} will be used"
+    try:
+        return int(str(am_raw).strip()), None
+    except ValueError:
+        return 0, "not a number, the row will be skipped"
+
+
+def validate_rows(rows):
+    """Check the INPUT rows of read_input; returns the list of problems."""
+    problems = []
+    today_idx = today_index()
+
+    for source_row in rows:
+        r = source_row["row"]
+        period = source_row["period"]
+        am_raw = source_row["am_raw"]
+
+        if am_raw is None or (isinstance(am_raw, str) and not am_raw.strip()):
+            if period:
+                problems.append(diagnostic(
+                    WARNING, MISSING_VALUE, f"Row {r}: period '{period}' has no AM, the row will be skipped.",
+                    row=r, period=period,
+                ))
+            continue
+
+        am, am_problem = _am_value(am_raw)
+        if am_problem:
+            problems.append(diagnostic(
+                WARNING, INVALID_AM, f"Row {r}: AM value '{am_raw}' is {am_problem}.", row=r, am=am_raw,
+            ))
+        if am == 0:
+            continue
+        if am < 0:
+            problems.append(diagnostic(
+                WARNING, NEGATIVE_AM,
+                f"Row {r}: AM {am} is negative, the project will get no months.",
+                row=r, am=am,
+            ))
+        if not period:
+            problems.append(diagnostic(
+                WARNING, MISSING_VALUE, f"Row {r}: AM {am} has no period, the row will be skipped.", row=r, am=am,
+            ))
+            continue
+
+        try:
+            start_idx, end_idx = parse_period_range(period, today_idx)
+        except ValueError as e:
+            problems.append(diagnostic(
+                WARNING, PERIOD_PARSE_ERROR, f"Row {r}: {e}", row=r, period=period,
+            ))
+            continue
+
+        months = months_in_range(start_idx, end_idx)
+        if am > months:
+            problems.append(diagnostic(
+                WARNING, AM_EXCEEDS_PERIOD,
+                f"Row {r}: {am} AM do not fit in the {months} months of '{period}'.",
+                row=r, period=period, am=am, months=months,
+            ))
+
+    return problems
+
+
+def validate_input(uploaded_input_file):
+    """Dry run: return the problems of one INPUT workbook (no template, no allocation)."""
+    try:
+        source = read_input(uploaded_input_file, cv_columns=())
+    except ValueError as e:
+        return [diagnostic(ERROR, MISSING_COLUMNS, str(e))]
+    except Exception as e: # not an xlsx or a damaged one; report it instead of failing
+        return [diagnostic(ERROR, INVALID_WORKBOOK, f"The file cannot be read as an Excel workbook: {e}")]
+    return validate_rows(source["rows"])
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m manmonths.validate",
+                                     description="Έλεγχος INPUT excel χωρίς επεξεργασία.")
+    parser.add_argument("inputs", nargs="+", help="Αρχεία INPUT .xlsx")
+    parser.add_argument("--json", action="store_true", help="Έξοδος σε JSON")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    results = {}
+    for path in args.inputs:
+        with open(path, "rb") as f:
+            results[path] = validate_input(f)
+
+    if args.json:
+        json.dump(results, sys.stdout, ensure_ascii=False, indent=2, default=str)
+        print()
+    else:
+        for path, problems in results.items():
+            print(f"{path}: {len(problems) or 'OK'}")
+            for problem in problems:
+                print(f"  [{problem['level']}] {problem['message']}")
+
+    if any(has_errors(problems) for problems in results.values()):
+        return 2
+    return 1 if any(results.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,59 @@
+import csv
+import io
+import json
+
+from manmonths.bench import generate_input
+from manmonths.cli import main
+from manmonths.engine import allocate
+from manmonths.export import allocate_data, csv_tables, month_label, to_csv, to_json
+from manmonths.pipeline import build_projects, new_counters
+from manmonths.reader import read_input
+
+INPUT = generate_input(rows=60, span=(1, 24), years=(2015, 2020), seed=3)
+
+
+def expected_allocation():
+    projects = build_projects(read_input(io.BytesIO(INPUT), cv_columns=())["rows"], [], new_counters())
+    return allocate(projects, 9)
+
+
+def test_json_round_trips_the_allocation():
+    allocation = expected_allocation()
+    output = allocate_data(io.BytesIO(INPUT), max_yearly_capacity=9)["output"]
+    data = json.loads(to_json(output))
+
+    assert data == output
+    assert data["assignment"] == {month_label(m): pid for m, pid in sorted(allocation["assignment"].items())}
+    assert data["yearly_am_totals"] == {str(y): total for y, total in allocation["yearly_am_totals"].items()}
+    by_id = {proj["project_id"]: proj for proj in allocation["projects"]}
+    for proj in data["projects"]:
+        assert (proj["allocated_am"], proj["unallocated_am"]) == (by_id[proj["project_id"]]["allocated_am"],
+                                                                  by_id[proj["project_id"]]["unallocated_am"])
+        assert len(proj["months"]) == proj["allocated_am"]
+    assert [p["period"] for p in data["unallocated_projects"]] == \
+        [p["period_str"] for p in allocation["projects"] if p["unallocated_am"] > 0]
+
+
+def test_csv_tables_round_trip():
+    output = allocate_data(io.BytesIO(INPUT), max_yearly_capacity=9)["output"]
+    tables = {name: list(csv.reader(io.StringIO(to_csv(header, rows))))
+              for name, (header, rows) in csv_tables(output).items()}
+
+    assert {month: int(pid) for month, pid, _, _ in tables["assignment"][1:]} == output["assignment"]
+    assert {year: int(total) for year, total, _ in tables["yearly_totals"][1:]} == output["yearly_am_totals"]
+    assert {year: int(over) for year, _, over in tables["yearly_totals"][1:] if int(over)} == output["yearly_overages"]
+    assert [row[4] for row in tables["unallocated"][1:]] == [p["reasons"] for p in output["unallocated_projects"]]
+
+
+def test_cli_writes_the_data_formats(tmp_path):
+    input_path = tmp_path / "cv.xlsx"
+    input_path.write_bytes(INPUT)
+    for output_format in ("json", "csv"):
+        assert main([str(input_path), "--output-dir", str(tmp_path / output_format), "--format", output_format,
+                     "--workers", "1"]) == 0
+
+    with open(tmp_path / "json" / "cv_ΚΑΤΑΝΟΜΗ ΑΜ.json", encoding="utf-8") as f:
+        data = json.load(f)
+    with open(tmp_path / "csv" / "cv_ΚΑΤΑΝΟΜΗ ΑΜ.assignment.csv", encoding="utf-8", newline="") as f:
+        rows = list(csv.reader(f))
+    assert {month: int(pid) for month, pid, _, _ in rows[1:]} == data["assignment"]
@@ -0,0 +1,50 @@
+from manmonths.engine import allocate
+from manmonths.golden import FAMILIES, golden_case
+from manmonths.pipeline import build_projects, new_counters
+
+
+def projects_of(*periods):
+    rows = [
+        {"row": r, "period": period, "am_raw": am, "is_yellow": is_yellow}
+        for r, (period, am, is_yellow) in enumerate(periods, start=2)
+    ]
+    return build_projects(rows, [], new_counters())
+
+
+def test_negative_am_gets_no_months():
+    for solver in ("greedy", "optimal"):
+        allocation = allocate(projects_of(("01/2020 - 12/2020", -3, False), ("01/2020 - 12/2020", 2, False)),
+                              solver=solver)
+        negative = next(p for p in allocation["projects"] if p["original_am"] < 0)
+        assert (negative["allocated_am"], negative["unallocated_am"]) == (0, -3), solver
+
+
+def test_yellow_projects_are_served_first():
+    projects = projects_of(
+        ("01/2020 - 06/2020", 6, False),
+        ("01/2020 - 12/2020", 8, True),
+        ("03/2020 - 12/2020", 6, False),
+    )
+    allocation = allocate(projects, max_yearly_capacity=9, solver="optimal")
+    by_row = {p["input_row"]: p for p in allocation["projects"]}
+    assert by_row[3]["allocated_am"] == 8
+    # The one month left goes to the shorter period, as in the greedy Pass 2
+    assert by_row[2]["allocated_am"] == 1 and by_row[4]["allocated_am"] == 0
+
+
+def test_optimal_places_at_least_as_many_months_as_greedy():
+    for family in FAMILIES:
+        for seed in range(3):
+            case = golden_case(family, seed)
+            allocations = {
+                solver: allocate(build_projects(case["rows"], [], new_counters()), case["max_yearly_capacity"],
+                                 solver=solver, order=case["order"])
+                for solver in ("greedy", "optimal")
+            }
+            assert len(allocations["optimal"]["assignment"]) >= len(allocations["greedy"]["assignment"]), case
+
+            optimal = allocations["optimal"]
+            assert all(total <= case["max_yearly_capacity"] for total in optimal["yearly_am_totals"].values())
+            for proj in optimal["projects"]:
+                assert 0 <= proj["allocated_am"] <= max(proj["original_am"], 0)
+                assert proj["allocated_am"] + proj["unallocated_am"] == proj["original_am"]
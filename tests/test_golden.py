@@ -0,0 +1,18 @@
+from manmonths.engine import allocate_greedy, enforce_yearly_capacity
+from manmonths.flow import allocate_optimal
+from manmonths.golden import differential, enforcement_differential
+
+
+def test_greedy_matches_the_original_allocation():
+    result = differential(allocate_greedy, cases=5)
+    assert result["cases"] > 0
+    assert result["failures"] == []
+
+
+def test_capacity_enforcement_matches_the_original():
+    assert enforcement_differential(enforce_yearly_capacity, cases=20)["failures"] == []
+
+
+def test_optimal_solver_keeps_the_invariants():
+    result = differential(allocate_optimal, cases=5, invariants_only=True)
+    assert result["failures"] == []
@@ -0,0 +1,45 @@
+import json
+
+from manmonths.engine import allocate
+from manmonths.incremental import allocate_incremental
+from manmonths.pipeline import build_projects, new_counters
+
+
+def rows_of(*periods):
+    return [
+        {"row": r, "period": period, "am_raw": am, "is_yellow": is_yellow}
+        for r, (period, am, is_yellow) in enumerate(periods, start=2)
+    ]
+
+
+def projects_of(rows):
+    return build_projects(rows, [], new_counters())
+
+
+def outcome(allocation):
+    return (
+        [(p["project_id"], p["allocated_am"], p["unallocated_am"], set(p["reasons_log"])) for p in allocation["projects"]],
+        allocation["assignment"],
+        allocation["yearly_am_totals"],
+    )
+
+
+def test_inserted_row_reuses_untouched_groups():
+    rows = rows_of(
+        ("01/2010 - 12/2010", 8, False),
+        ("03/2010 - 06/2010", 4, True),
+        ("01/2015 - 12/2016", 20, False),
+        ("06/2015 - 08/2015", 3, False),
+        ("01/2020 - 06/2020", 6, True),
+        ("02/2020 - 12/2020", 11, False),
+    )
+    first = allocate_incremental(projects_of(rows), max_yearly_capacity=11)
+    state = json.loads(json.dumps(first["state"]))
+
+    # A new first row shifts every project id, but only touches the 2020 group
+    rows = rows_of(("05/2020 - 07/2020", 2, False), *((r["period"], r["am_raw"], r["is_yellow"]) for r in rows))
+    second = allocate_incremental(projects_of(rows), state, max_yearly_capacity=11)
+
+    assert second["counters"]["groups_reused"] == 2
+    assert second["counters"]["groups_recomputed"] == 1
+    assert outcome(second) == outcome(allocate(projects_of(rows), 11))
@@ -0,0 +1,75 @@
+import os
+import time
+
+import openpyxl
+import pytest
+
+from manmonths.bench import generate_input
+from manmonths.jobs import CANCELLED, DONE, QUEUED, RUNNING, SINGLE_SHEET, JobQueue, _run_job
+from manmonths.progress import Cancelled
+from manmonths.template import TEMPLATE_FILE_NAME
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TEMPLATE = os.path.join(ROOT, TEMPLATE_FILE_NAME)
+TIMEOUT_SECONDS = 60
+
+
+@pytest.fixture
+def queue():
+    queue = JobQueue(max_workers=1)
+    yield queue
+    queue.shutdown()
+
+
+def wait_for(queue, key, states):
+    deadline = time.monotonic() + TIMEOUT_SECONDS
+    while time.monotonic() < deadline:
+        status = queue.status(key)
+        if status["state"] in states:
+            return status
+        time.sleep(0.01)
+    raise AssertionError(f"job {key} did not reach {states}")
+
+
+def test_submit_runs_to_done_and_reuses_the_job(queue):
+    input_bytes = generate_input(rows=20)
+    queue.submit("small", TEMPLATE, input_bytes, max_yearly_capacity=11)
+    status = wait_for(queue, "small", (DONE,))
+
+    assert status["progress"] == 1.0
+    result = status["result"]
+    assert result["diagnostics"] == []
+    assert openpyxl.load_workbook(result["output"]).sheetnames == ["CV", "ΑΝΑΛΥΣΗ"]
+
+    # Same key: the finished job is returned, nothing runs again
+    queue.submit("small", TEMPLATE, input_bytes, max_yearly_capacity=11)
+    assert queue.status("small")["state"] == DONE
+    assert queue.status("small")["result"]["output"] == result["output"]
+
+
+def test_cancel_a_queued_job(queue):
+    queue.submit("first", TEMPLATE, generate_input(rows=2000))
+    queue.submit("second", TEMPLATE, generate_input(rows=20))
+    assert queue.status("second")["state"] == QUEUED
+
+    # The pool may already hold it in its call queue; it then stops at its first phase
+    assert queue.cancel("second")
+    queue.cancel("first")
+    assert wait_for(queue, "second", (CANCELLED, DONE))["state"] == CANCELLED
+    # A cancelled key can be submitted again
+    queue.submit("second", TEMPLATE, generate_input(rows=20))
+    assert wait_for(queue, "second", (DONE,))["state"] == DONE
+
+
+def test_cancel_a_running_job_stops_it_at_the_next_phase(queue):
+    queue.submit("large", TEMPLATE, generate_input(rows=3000))
+    wait_for(queue, "large", (RUNNING,))
+
+    assert queue.cancel("large")
+    assert wait_for(queue, "large", (CANCELLED, DONE))["state"] == CANCELLED
+
+
+def test_worker_raises_cancelled_when_asked(tmp_path):
+    with pytest.raises(Cancelled):
+        _run_job(0, {}, {0: True}, SINGLE_SHEET, TEMPLATE, generate_input(rows=5), str(tmp_path / "0.xlsx"), {})
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,79 @@
+import io
+import os
+import zipfile
+
+import openpyxl
+import pytest
+
+from manmonths.multisheet import MAX_SHEET_TITLE, process_person_sheets, sheet_titles
+from manmonths.reader import AM_HEADER, PERIOD_HEADER
+from manmonths.template import MERGED, TEMPLATE_FILE_NAME, ZIP
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TEMPLATE = os.path.join(ROOT, TEMPLATE_FILE_NAME)
+
+PEOPLE = {
+    "Μαρία Κ.": [("Έργο 1", "01/2020 - 06/2020", 4), ("Έργο 2", "03/2020 - 12/2021", 10)],
+    "Γιάννης": [("Έργο 3", "2019", 6)],
+}
+
+
+def people_input():
+    wb = openpyxl.Workbook()
+    wb.active.title = "Σημειώσεις" # no period/AM columns, so not a person
+    wb.active.append(["Οδηγίες"])
+    for name, rows in PEOPLE.items():
+        ws = wb.create_sheet(name)
+        ws.append(["ΕΡΓΟ", PERIOD_HEADER, AM_HEADER])
+        for row in rows:
+            ws.append(list(row))
+    buffer = io.BytesIO()
+    wb.save(buffer)
+    buffer.seek(0)
+    return buffer
+
+
+def test_sheet_titles_fit_and_are_unique_ignoring_case():
+    long_name = "Παπαδοπούλου-Αλεξανδροπούλου Αικατερίνη"
+    titles = sheet_titles([long_name, long_name + " Β", "Ana", "ANA", "ana"], "ΑΝΑΛΥΣΗ")
+
+    assert all(len(title) <= MAX_SHEET_TITLE for pair in titles for title in pair)
+    assert titles[0] == (f"ΑΝΑΛΥΣΗ {long_name[:23]}", f"CV {long_name[:23]}")
+    assert titles[1] == (f"ΑΝΑΛΥΣΗ {long_name[:21]}~2", f"CV {long_name[:21]}~2")
+    assert [analysis for analysis, _ in titles[2:]] == ["ΑΝΑΛΥΣΗ Ana", "ΑΝΑΛΥΣΗ ANA~2", "ΑΝΑΛΥΣΗ ana~3"]
+    assert len({title.casefold() for pair in titles for title in pair}) == 2 * len(titles)
+
+
+def test_merged_run_has_a_sheet_pair_per_person():
+    run = process_person_sheets(TEMPLATE, people_input(), layout=MERGED, workers=1)
+    assert [person["name"] for person in run["people"]] == list(PEOPLE)
+    with run["output"] as output:
+        wb = openpyxl.load_workbook(output)
+
+    # CV first, as in the single-person output
+    assert wb.sheetnames == ["CV Μαρία Κ.", "ΑΝΑΛΥΣΗ Μαρία Κ.", "CV Γιάννης", "ΑΝΑΛΥΣΗ Γιάννης"]
+    for name, rows in PEOPLE.items():
+        assert [row[1:3] for row in wb[f"CV {name}"].iter_rows(min_row=2, values_only=True)] == \
+            [row[1:] for row in rows]
+
+
+def test_match_formulas_quote_the_person_cv_sheet():
+    run = process_person_sheets(TEMPLATE, people_input(), layout=MERGED, workers=1)
+    with run["output"] as output:
+        wb = openpyxl.load_workbook(output)
+
+    for name in PEOPLE:
+        formulas = [cell.value for (cell,) in wb[f"ΑΝΑΛΥΣΗ {name}"].iter_rows(min_col=1, max_col=1)
+                    if isinstance(cell.value, str) and cell.value.startswith("=MATCH(")]
+        assert formulas
+        assert all(f"'CV {name}'!$B$2:" in formula for formula in formulas)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_zip_run_has_a_workbook_per_person(workers):
+    run = process_person_sheets(TEMPLATE, people_input(), layout=ZIP, workers=workers)
+    with run["output"] as output, zipfile.ZipFile(output) as archive:
+        assert archive.namelist() == [f"{name}_ΚΑΤΑΝΟΜΗ ΑΜ.xlsx" for name in PEOPLE]
+        for name in PEOPLE:
+            wb = openpyxl.load_workbook(io.BytesIO(archive.read(f"{name}_ΚΑΤΑΝΟΜΗ ΑΜ.xlsx")))
+            assert wb.sheetnames == ["CV", "ΑΝΑΛΥΣΗ"]
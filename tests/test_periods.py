@@ -0,0 +1,71 @@
+import pytest
+
+from manmonths.periods import TODAY, month_index, parse_date_index, parse_period_range
+
+TODAY_IDX = month_index(2024, 5)
+
+
+@pytest.mark.parametrize("period, expected", [
+    # Formats of the original parser
+    ("2019", ((2019, 1), (2019, 12))),
+    (2019, ((2019, 1), (2019, 12))),
+    ("2018 - 2019", ((2018, 1), (2019, 12))),
+    ("3/2019 - 5/2020", ((2019, 3), (2020, 5))),
+    ("03/2019 - 05/2020", ((2019, 3), (2020, 5))),
+    ("15/3/2019 - 20/05/2020", ((2019, 3), (2020, 5))),
+    ("03/2019 — 05/2020", ((2019, 3), (2020, 5))),
+    ("03/2019 – 05/2020", ((2019, 3), (2020, 5))),
+    ("03/2019-05/2020", ((2019, 3), (2020, 5))),
+    ("  03/2019   -   05/2020 ", ((2019, 3), (2020, 5))),
+    ("29/2/2020 - 2021", ((2020, 2), (2021, 12))),
+    # Reversed periods parse; they simply have no months
+    ("05/2020 - 03/2019", ((2020, 5), (2019, 3))),
+    # ISO 'YYYY-MM'
+    ("2019-03 - 2020-05", ((2019, 3), (2020, 5))),
+    ("2019-3 - 05/2020", ((2019, 3), (2020, 5))),
+    ("2019-03-2020-05", ((2019, 3), (2020, 5))),
+    # Greek month names, with or without accents, nominative or genitive
+    ("Μάρτιος 2019 - Μάιος 2020", ((2019, 3), (2020, 5))),
+    ("ΜΑΡΤΙΟΥ 2019 - Μαΐου 2020", ((2019, 3), (2020, 5))),
+    ("Σεπ. 2019 - Ιαν 2020", ((2019, 9), (2020, 1))),
+    # A lone month is a one-month period
+    ("3/2019", ((2019, 3), (2019, 3))),
+    ("2019-03", ((2019, 3), (2019, 3))),
+    ("Μάρτιος 2019", ((2019, 3), (2019, 3))),
+])
+def test_period_formats(period, expected):
+    (start_year, start_month), (end_year, end_month) = expected
+    assert parse_period_range(period, TODAY_IDX) == (month_index(start_year, start_month),
+                                                     month_index(end_year, end_month))
+
+
+@pytest.mark.parametrize("period", ["03/2019 - Σήμερα", "03/2019 - σημερα", "2019-03 - ΣΗΜΕΡΑ", "2019-03-Σήμερα",
+                                    "03/2019 - simera"])
+def test_today_resolves_to_the_given_month(period):
+    assert parse_period_range(period, TODAY_IDX) == (month_index(2019, 3), TODAY_IDX)
+
+
+def test_today_is_a_marker_until_the_period_is_resolved():
+    assert parse_date_index("Σήμερα", is_start=False) == TODAY
+    with pytest.raises(ValueError):
+        parse_date_index("Σήμερα", is_start=True)
+
+
+@pytest.mark.parametrize("period", [
+    "garbage",
+    "Σήμερα",
+    "Σήμερα - 2020",
+    "13/2019 - 05/2020",
+    "0/2019 - 05/2020",
+    "30/2/2019 - 2020",
+    "2019-13",
+    "03/19 - 05/20",
+    "2019 - 2020 - 2021",
+    "Foo 2019 - 2020",
+    "Μα 2019 - 2020",
+    "03/2019 -",
+    "",
+])
+def test_malformed_periods_raise(period):
+    with pytest.raises(ValueError):
+        parse_period_range(period, TODAY_IDX)
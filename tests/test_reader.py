@@ -0,0 +1,65 @@
+import io
+
+import openpyxl
+from openpyxl.styles import Font, PatternFill
+
+from manmonths.reader import AM_HEADER, PERIOD_HEADER, _read_sheet, read_input
+
+
+def input_workbook():
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.append(["ΕΡΓΟ", PERIOD_HEADER, AM_HEADER, "ΦΟΡΕΑΣ"])
+    ws.append(["Έργο 1", "01/2020 - 06/2020", 4, "Φορέας 1"])
+    ws.append(["Έργο 2", "2019", 12, None])
+    ws.append([None, None, None, "σημείωση"])
+    ws["B3"].fill = PatternFill(start_color="FFFFFF00", end_color="FFFFFF00", fill_type="solid")
+    ws["A2"].font = Font(bold=True)
+    ws["C3"].font = Font(bold=True)
+    ws.column_dimensions["B"].width = 24
+    ws.column_dimensions["D"].width = 12
+    buffer = io.BytesIO()
+    wb.save(buffer)
+    buffer.seek(0)
+    return buffer
+
+
+def test_one_pass_returns_rows_widths_and_cv_rows():
+    wb = openpyxl.load_workbook(input_workbook(), read_only=True)
+    styles = {}
+    source = _read_sheet(wb.active, styles_by_key=styles)
+
+    assert source["headers"] == {"ΕΡΓΟ": 1, PERIOD_HEADER: 2, AM_HEADER: 3, "ΦΟΡΕΑΣ": 4}
+    assert source["rows"] == [
+        {"row": 2, "period": "01/2020 - 06/2020", "am_raw": 4, "is_yellow": False},
+        {"row": 3, "period": "2019", "am_raw": 12, "is_yellow": True},
+        {"row": 4, "period": None, "am_raw": None, "is_yellow": False},
+    ]
+    assert source["column_widths"] == {2: 24, 4: 12}
+    assert source["last_rows"] == {1: 3, 2: 3, 3: 3, 4: 4}
+
+    # Every row of the 'CV' copy, its non-empty cells with their style keys
+    cv_rows = source["cv_rows"]
+    assert [[(c, value) for c, value, _ in row] for row in cv_rows] == [
+        [(1, "ΕΡΓΟ"), (2, PERIOD_HEADER), (3, AM_HEADER), (4, "ΦΟΡΕΑΣ")],
+        [(1, "Έργο 1"), (2, "01/2020 - 06/2020"), (3, 4), (4, "Φορέας 1")],
+        [(1, "Έργο 2"), (2, "2019"), (3, 12)],
+        [(4, "σημείωση")],
+    ]
+    # A2 and C3 look the same, so they share one style
+    bold_keys = {style_key for row in cv_rows for c, value, style_key in row if value in ("Έργο 1", 12)}
+    assert len(bold_keys) == 1 and None not in bold_keys
+    assert styles[bold_keys.pop()][0].b
+    wb.close()
+
+
+def test_cv_columns_limit_the_copy():
+    styles = {}
+    source = read_input(input_workbook(), cv_columns=(2,), styles_by_key=styles, cv_styles=False)
+    assert source["column_widths"] == {2: 24}
+    assert source["last_rows"] == {2: 3}
+    assert [[(c, value) for c, value, _ in row] for row in source["cv_rows"]] == [
+        [(2, PERIOD_HEADER)], [(2, "01/2020 - 06/2020")], [(2, "2019")], [],
+    ]
+    assert styles == {}
+    assert "cv_rows" not in read_input(input_workbook(), cv_columns=())
@@ -0,0 +1,78 @@
+import os
+import random
+
+import openpyxl
+
+from manmonths.pipeline import process_excel_data
+from manmonths.template import TEMPLATE_FILE_NAME, YEAR_ROW
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA = os.path.join(ROOT, "tests", "data")
+
+# baseline_output.xlsx is what the original single-function app wrote for
+# baseline_input.xlsx, with random.seed(0) for the year header colours
+
+
+def colour(color):
+    if color is None:
+        return None
+    return color.type, getattr(color, color.type)
+
+
+def cell_looks(ws):
+    result = {}
+    for row in ws.iter_rows():
+        for cell in row:
+            font, alignment = cell.font, cell.alignment
+            result[cell.coordinate] = {
+                "value": cell.value,
+                "number_format": cell.number_format,
+                "font": (font.name, font.sz, font.b, font.i, colour(font.color)),
+                "alignment": (alignment.horizontal, alignment.vertical, alignment.wrap_text),
+                "border": tuple(getattr(getattr(cell.border, side), "style", None)
+                                for side in ("left", "right", "top", "bottom")),
+                # The year header colours are random
+                "fill": cell.fill.fgColor.rgb if cell.fill.fill_type and cell.row != YEAR_ROW else None,
+            }
+    return result
+
+
+def sheet_layout(ws):
+    return {
+        "merged": sorted(str(merged) for merged in ws.merged_cells.ranges),
+        "widths": {key: dim.width for key, dim in ws.column_dimensions.items() if dim.customWidth},
+    }
+
+
+def differences(expected, actual):
+    assert expected.sheetnames == actual.sheetnames
+    found = []
+    for title in expected.sheetnames:
+        expected_ws, actual_ws = expected[title], actual[title]
+        expected_layout, actual_layout = sheet_layout(expected_ws), sheet_layout(actual_ws)
+        found += [(title, part, expected_layout[part], actual_layout[part])
+                  for part in expected_layout if expected_layout[part] != actual_layout[part]]
+
+        expected_cells, actual_cells = cell_looks(expected_ws), cell_looks(actual_ws)
+        for coordinate in sorted(expected_cells.keys() | actual_cells.keys()):
+            if coordinate not in actual_cells or coordinate not in expected_cells:
+                found.append((title, coordinate, expected_cells.get(coordinate), actual_cells.get(coordinate)))
+                continue
+            found += [
+                (title, coordinate, part, expected_cells[coordinate][part], actual_cells[coordinate][part])
+                for part in expected_cells[coordinate]
+                if expected_cells[coordinate][part] != actual_cells[coordinate][part]
+            ]
+    return found
+
+
+def test_output_matches_the_baseline():
+    expected = openpyxl.load_workbook(os.path.join(DATA, "baseline_output.xlsx"))
+
+    random.seed(0)
+    with open(os.path.join(DATA, "baseline_input.xlsx"), "rb") as f:
+        result = process_excel_data(os.path.join(ROOT, TEMPLATE_FILE_NAME), f)
+    with result["output"] as output:
+        actual = openpyxl.load_workbook(output)
+
+    assert differences(expected, actual) == []
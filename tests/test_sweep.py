@@ -0,0 +1,64 @@
+import copy
+import io
+
+import openpyxl
+import pytest
+
+from manmonths.bench import generate_input
+from manmonths.diagnostics import MISSING_COLUMNS
+from manmonths.engine import allocate
+from manmonths.pipeline import build_projects, new_counters
+from manmonths.reader import read_input
+from manmonths.sweep import sweep, sweep_projects
+
+INPUT = generate_input(rows=40, span=(1, 24), years=(2016, 2020), seed=5)
+CAPACITIES = (6, 11)
+ORDERS = ("yellow_short_first", "long_first")
+SOLVERS = ("greedy", "optimal")
+
+
+def projects():
+    return build_projects(read_input(io.BytesIO(INPUT), cv_columns=())["rows"], [], new_counters())
+
+
+def test_small_grid_in_grid_order():
+    result = sweep(io.BytesIO(INPUT), CAPACITIES, ORDERS, SOLVERS, workers=2)
+    assert result["diagnostics"] == []
+    scenarios = result["scenarios"]
+    assert [(s["max_yearly_capacity"], s["order"], s["solver"]) for s in scenarios] == [
+        (capacity, order, solver) for capacity in CAPACITIES for order in ORDERS for solver in SOLVERS
+    ]
+
+    # Each row is the allocation of that scenario on its own
+    for scenario in scenarios:
+        allocation = allocate(projects(), scenario["max_yearly_capacity"], solver=scenario["solver"],
+                              order=scenario["order"])
+        assert scenario["allocated_am"] == len(allocation["assignment"])
+        assert scenario["allocated_am"] + scenario["unallocated_am"] == sum(p["original_am"] for p in projects())
+    # The optimal solver never places fewer months
+    for greedy, optimal in zip(scenarios[::2], scenarios[1::2]):
+        assert optimal["allocated_am"] >= greedy["allocated_am"]
+
+    # Workers get copies: running in this process gives the same rows
+    assert sweep_projects(projects(), CAPACITIES, ORDERS, SOLVERS, workers=1) == scenarios
+
+
+def test_scenarios_leave_the_projects_untouched():
+    shared = projects()
+    before = copy.deepcopy(shared)
+    sweep_projects(shared, CAPACITIES, ORDERS, SOLVERS, workers=1)
+    assert shared == before
+
+
+def test_unknown_order_and_missing_columns():
+    with pytest.raises(ValueError):
+        sweep_projects(projects(), CAPACITIES, ("no_such_order",), workers=1)
+
+    wb = openpyxl.load_workbook(io.BytesIO(generate_input(rows=1)))
+    wb.active["B1"] = "ΠΕΡΙΟΔΟΣ"
+    buffer = io.BytesIO()
+    wb.save(buffer)
+    buffer.seek(0)
+    result = sweep(buffer, CAPACITIES, ORDERS, workers=1)
+    assert result["scenarios"] == []
+    assert [d["code"] for d in result["diagnostics"]] == [MISSING_COLUMNS]
@@ -0,0 +1,32 @@
+from manmonths.periods import month_index
+from manmonths.team import team_grid, team_summary
+
+
+def person(name, *months):
+    return {"name": name, "input": f"{name}.xlsx", "error": None, "months": sorted(months),
+            "requested_am": len(months), "unallocated_am": 0}
+
+
+def test_team_summary_from_the_month_grid():
+    people = [
+        person("Α", *(month_index(2020, m) for m in range(1, 12)), month_index(2021, 3)),
+        person("Β", month_index(2020, 3), month_index(2022, 12)),
+        person("Γ"),
+    ]
+    grid, first_year, span = team_grid(people)
+    assert (first_year, span, len(grid)) == (2020, 36, 3 * 36)
+
+    summary = team_summary(people, max_yearly_capacity=11)
+    assert summary["years"] == [2020, 2021, 2022]
+    assert [p["yearly_am_totals"] for p in summary["people"]] == [
+        {2020: 11, 2021: 1, 2022: 0}, {2020: 1, 2021: 0, 2022: 1}, {2020: 0, 2021: 0, 2022: 0},
+    ]
+    assert summary["team_yearly_totals"] == {2020: 12, 2021: 1, 2022: 1}
+    assert summary["at_cap"] == {2020: ["Α"]}
+    assert summary["peak_headcount"] == 2
+    assert summary["peak_months"] == ["2020-03"]
+
+
+def test_empty_team():
+    summary = team_summary([person("Α")])
+    assert summary["years"] == [] and summary["peak_headcount"] == 0
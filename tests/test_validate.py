@@ -0,0 +1,64 @@
+import openpyxl
+import pytest
+
+from manmonths.diagnostics import (
+    AM_EXCEEDS_PERIOD,
+    INVALID_AM,
+    INVALID_WORKBOOK,
+    MISSING_COLUMNS,
+    NEGATIVE_AM,
+    PERIOD_PARSE_ERROR,
+)
+from manmonths.engine import allocate
+from manmonths.pipeline import build_projects, new_counters
+from manmonths.reader import AM_HEADER, PERIOD_HEADER, read_input
+from manmonths.validate import main, validate_input
+
+
+def write_input(path, rows, headers=(PERIOD_HEADER, AM_HEADER)):
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.append(list(headers))
+    for row in rows:
+        ws.append(list(row))
+    wb.save(path)
+    return str(path)
+
+
+def codes(path):
+    with open(path, "rb") as f:
+        return [problem["code"] for problem in validate_input(f)]
+
+
+@pytest.mark.parametrize("rows, headers, expected_codes, exit_code", [
+    ([("01/2020 - 12/2020", 6), ("2019", 12)], (PERIOD_HEADER, AM_HEADER), [], 0),
+    ([("01/2020 - 12/2020", 6)], ("ΠΕΡΙΟΔΟΣ", AM_HEADER), [MISSING_COLUMNS], 2),
+    ([("01/2020 - 12/2020", 6), ("13/2020 - 2021", 2)], (PERIOD_HEADER, AM_HEADER), [PERIOD_PARSE_ERROR], 1),
+    ([("01/2020 - 12/2020", "έξι")], (PERIOD_HEADER, AM_HEADER), [INVALID_AM], 1),
+    ([("01/2020 - 12/2020", 2.5)], (PERIOD_HEADER, AM_HEADER), [INVALID_AM], 1),
+    ([("01/2020 - 03/2020", 4)], (PERIOD_HEADER, AM_HEADER), [AM_EXCEEDS_PERIOD], 1),
+    ([("01/2020 - 12/2020", -3)], (PERIOD_HEADER, AM_HEADER), [NEGATIVE_AM], 1),
+])
+def test_problems_and_exit_codes(tmp_path, rows, headers, expected_codes, exit_code):
+    path = write_input(tmp_path / "input.xlsx", rows, headers)
+    assert codes(path) == expected_codes
+    assert main([path]) == exit_code
+
+
+def test_not_a_workbook(tmp_path):
+    path = tmp_path / "input.xlsx"
+    path.write_bytes(b"not a zip")
+    assert codes(path) == [INVALID_WORKBOOK]
+    assert main([str(path)]) == 2
+
+
+def test_boolean_am_reports_what_the_pipeline_allocates(tmp_path):
+    path = write_input(tmp_path / "input.xlsx", [("01/2020 - 12/2020", True)])
+    with open(path, "rb") as f:
+        (problem,) = validate_input(f)
+    assert problem["code"] == INVALID_AM
+    assert "1 will be used" in problem["message"]
+
+    with open(path, "rb") as f:
+        projects = build_projects(read_input(f)["rows"], [], new_counters())
+    assert allocate(projects)["projects"][0]["allocated_am"] == 1